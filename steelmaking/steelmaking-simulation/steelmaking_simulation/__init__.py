@@ -26,9 +26,14 @@ from .config import (
     SimulationConfig,
     ProcessStatus,
     PROCESS_FLOW,
+    PROCESS_FLOW_IDX,
     PRO_LINE_CD,
     CREW_CODES,
     EQUIPMENT,
+    PROC_CD_BY_STEP,
+    DEVICES_BY_STEP,
+    DEVICES_BY_PROC_CD,
+    STEP_BY_PROC_CD,
     SPECIAL_EVENT_CONFIG,
     CANCEL_EVENT_PROBABILITY,
     REWORK_EVENT_PROBABILITY,
@@ -87,9 +92,14 @@ __all__ = [
     "SimulationConfig",
     "ProcessStatus",
     "PROCESS_FLOW",
+    "PROCESS_FLOW_IDX",
     "PRO_LINE_CD",
     "CREW_CODES",
     "EQUIPMENT",
+    "PROC_CD_BY_STEP",
+    "DEVICES_BY_STEP",
+    "DEVICES_BY_PROC_CD",
+    "STEP_BY_PROC_CD",
     "SPECIAL_EVENT_CONFIG",
     "CANCEL_EVENT_PROBABILITY",
     "REWORK_EVENT_PROBABILITY",
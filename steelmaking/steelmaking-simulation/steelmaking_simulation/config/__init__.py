@@ -1,17 +1,32 @@
 """Configuration package for steelmaking simulation."""
 
 from .settings import DatabaseConfig, SimulationConfig
-from .constants import ProcessStatus, PROCESS_FLOW, PRO_LINE_CD, CREW_CODES
-from .equipment import EQUIPMENT, SPECIAL_EVENT_CONFIG, CANCEL_EVENT_PROBABILITY, REWORK_EVENT_PROBABILITY
+from .constants import ProcessStatus, PROCESS_FLOW, PROCESS_FLOW_IDX, PRO_LINE_CD, CREW_CODES, HEAT_SEQ_SPAN
+from .equipment import (
+    EQUIPMENT,
+    PROC_CD_BY_STEP,
+    DEVICES_BY_STEP,
+    DEVICES_BY_PROC_CD,
+    STEP_BY_PROC_CD,
+    SPECIAL_EVENT_CONFIG,
+    CANCEL_EVENT_PROBABILITY,
+    REWORK_EVENT_PROBABILITY,
+)
 
 __all__ = [
     "DatabaseConfig",
     "SimulationConfig",
     "ProcessStatus",
     "PROCESS_FLOW",
+    "PROCESS_FLOW_IDX",
     "PRO_LINE_CD",
     "CREW_CODES",
+    "HEAT_SEQ_SPAN",
     "EQUIPMENT",
+    "PROC_CD_BY_STEP",
+    "DEVICES_BY_STEP",
+    "DEVICES_BY_PROC_CD",
+    "STEP_BY_PROC_CD",
     "SPECIAL_EVENT_CONFIG",
     "CANCEL_EVENT_PROBABILITY",
     "REWORK_EVENT_PROBABILITY",
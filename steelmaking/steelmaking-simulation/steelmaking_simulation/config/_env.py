@@ -0,0 +1,31 @@
+"""Typed environment variable readers for configuration defaults."""
+
+import os
+
+from dotenv import load_dotenv
+
+# Load .env once, before any configuration default is read.
+load_dotenv()
+
+
+def env_str(key: str, default: str) -> str:
+    """Return the string value of an environment variable."""
+    return os.environ.get(key, default)
+
+
+def env_int(key: str, default: int) -> int:
+    """Return an environment variable parsed as int."""
+    return int(os.environ.get(key, default))
+
+
+def env_float(key: str, default: float) -> float:
+    """Return an environment variable parsed as float."""
+    return float(os.environ.get(key, default))
+
+
+def env_bool(key: str, default: bool) -> bool:
+    """Return an environment variable parsed as bool ("1", "true", "yes", "on")."""
+    value = os.environ.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -1,5 +1,7 @@
 """Constants for steelmaking simulation."""
 
+from types import MappingProxyType
+
 
 # Process status codes
 class ProcessStatus:
@@ -10,10 +12,16 @@ class ProcessStatus:
 
 
 # Process flow order
-PROCESS_FLOW = ["BOF", "LF", "CCM"]
+PROCESS_FLOW = ("BOF", "LF", "CCM")
+
+# Step name -> position in PROCESS_FLOW
+PROCESS_FLOW_IDX = MappingProxyType({name: idx for idx, name in enumerate(PROCESS_FLOW)})
 
 # Crew codes
 CREW_CODES = ("A", "B", "C", "D")
 
 # Production line code
 PRO_LINE_CD = "G1"
+
+# Heat numbers are YYMMSSSSS: a five-digit sequence below the year/month prefix
+HEAT_SEQ_SPAN = 100_000
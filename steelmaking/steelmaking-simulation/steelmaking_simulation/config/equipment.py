@@ -1,6 +1,8 @@
 """Equipment configuration for steelmaking simulation."""
 
-import os
+from types import MappingProxyType
+
+from ._env import env_float
 
 
 # Equipment configuration
@@ -19,6 +21,12 @@ EQUIPMENT = {
     },
 }
 
+# Flat read-only views of EQUIPMENT, built once at import for hot-path lookups
+PROC_CD_BY_STEP = MappingProxyType({step: info["proc_cd"] for step, info in EQUIPMENT.items()})
+DEVICES_BY_STEP = MappingProxyType({step: tuple(info["devices"]) for step, info in EQUIPMENT.items()})
+DEVICES_BY_PROC_CD = MappingProxyType({info["proc_cd"]: tuple(info["devices"]) for info in EQUIPMENT.values()})
+STEP_BY_PROC_CD = MappingProxyType({info["proc_cd"]: step for step, info in EQUIPMENT.items()})
+
 
 # Special event configuration for 取消/回炉 events
 # Each process can have:
@@ -46,5 +54,5 @@ SPECIAL_EVENT_CONFIG = {
 
 # Environment variable driven probabilities for special events
 # These are probabilities per-operation during historical seeding
-CANCEL_EVENT_PROBABILITY = float(os.getenv("CANCEL_EVENT_PROBABILITY", "0.02"))  # 2% chance
-REWORK_EVENT_PROBABILITY = float(os.getenv("REWORK_EVENT_PROBABILITY", "0.03"))  # 3% chance
+CANCEL_EVENT_PROBABILITY = env_float("CANCEL_EVENT_PROBABILITY", 0.02)  # 2% chance
+REWORK_EVENT_PROBABILITY = env_float("REWORK_EVENT_PROBABILITY", 0.03)  # 3% chance
@@ -1,59 +1,82 @@
 """Configuration settings for the steelmaking simulation."""
 
-import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
 
-load_dotenv()
+from ._env import env_bool, env_float, env_int, env_str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
-    """Database connection configuration."""
-    host: str = os.getenv("DB_HOST", "localhost")
-    port: int = int(os.getenv("DB_PORT", "5432"))
-    database: str = os.getenv("DB_NAME", "postgres")
-    user: str = os.getenv("DB_USER", "postgres")
-    password: str = os.getenv("DB_PASSWORD", "")
+    """Database connection configuration (immutable once loaded)."""
+    host: str = env_str("DB_HOST", "localhost")
+    port: int = env_int("DB_PORT", 5432)
+    database: str = env_str("DB_NAME", "postgres")
+    user: str = env_str("DB_USER", "postgres")
+    password: str = env_str("DB_PASSWORD", "")
+    application_name: str = env_str("DB_APPLICATION_NAME", "steelmaking-simulation")
+    # Connection pool bounds for DatabaseManager
+    pool_min_conn: int = env_int("DB_POOL_MIN_CONN", 2)
+    pool_max_conn: int = env_int("DB_POOL_MAX_CONN", 8)
+    # Demo only: keep KPI stats UNLOGGED (no WAL; emptied after a crash).
+    # Applied on each demo reset; turning it off makes the table LOGGED again.
+    unlogged_demo_mode: bool = env_bool("DB_UNLOGGED_DEMO_MODE", False)
+
+    def connect_kwargs(self) -> dict:
+        """Keyword arguments for psycopg2.connect (no DSN string to build or parse)."""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "dbname": self.database,
+            "user": self.user,
+            "password": self.password,
+            "application_name": self.application_name,
+        }
 
     @property
     def connection_string(self) -> str:
-        return f"host={self.host} port={self.port} dbname={self.database} user={self.user} password={self.password}"
+        return (
+            f"host={self.host} port={self.port} dbname={self.database} user={self.user} "
+            f"password={self.password} application_name={self.application_name}"
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
-    """Simulation parameters configuration."""
+    """Simulation parameters configuration.
+
+    Defaults are read from the environment once, when this module is imported.
+    Fields stay mutable so scripts and tests can tune a single run.
+    """
     # Time interval between simulation ticks (seconds)
-    interval: int = int(os.getenv("SIMULATION_INTERVAL", "2"))
+    interval: int = env_int("SIMULATION_INTERVAL", 2)
     
     # Probability of starting a new heat each tick
-    new_heat_probability: float = float(os.getenv("NEW_HEAT_PROBABILITY", "0.3"))
+    new_heat_probability: float = env_float("NEW_HEAT_PROBABILITY", 0.3)
 
     # Allow BOF planning to look ahead when no slot is available right now (minutes)
-    new_heat_lookahead_minutes: int = int(os.getenv("NEW_HEAT_LOOKAHEAD_MINUTES", "240"))
+    new_heat_lookahead_minutes: int = env_int("NEW_HEAT_LOOKAHEAD_MINUTES", 240)
     
     # Operation duration range (minutes)
-    min_operation_duration: int = int(os.getenv("MIN_OPERATION_DURATION_MINUTES", "30"))
-    max_operation_duration: int = int(os.getenv("MAX_OPERATION_DURATION_MINUTES", "50"))
+    min_operation_duration: int = env_int("MIN_OPERATION_DURATION_MINUTES", 30)
+    max_operation_duration: int = env_int("MAX_OPERATION_DURATION_MINUTES", 50)
 
     # Transfer gap between BOF->LF->CCM for the same heat (minutes)
-    min_transfer_gap_minutes: int = int(os.getenv("MIN_TRANSFER_GAP_MINUTES", "20"))
-    max_transfer_gap_minutes: int = int(os.getenv("MAX_TRANSFER_GAP_MINUTES", "30"))
+    min_transfer_gap_minutes: int = env_int("MIN_TRANSFER_GAP_MINUTES", 20)
+    max_transfer_gap_minutes: int = env_int("MAX_TRANSFER_GAP_MINUTES", 30)
 
     # Max allowed device idle/rest time (minutes)
-    max_rest_duration_minutes: int = int(os.getenv("MAX_REST_DURATION_MINUTES", "20"))
+    max_rest_duration_minutes: int = env_int("MAX_REST_DURATION_MINUTES", 20)
     # Min required device rest time between consecutive operations (minutes)
-    min_rest_duration_minutes: int = int(os.getenv("MIN_REST_DURATION_MINUTES", "3"))
+    min_rest_duration_minutes: int = env_int("MIN_REST_DURATION_MINUTES", 3)
 
     # Prefer aligned routing: BOF#i -> LF#i -> CCM#i
-    aligned_route_probability: float = float(os.getenv("ALIGNED_ROUTE_PROBABILITY", "0.9"))
+    aligned_route_probability: float = env_float("ALIGNED_ROUTE_PROBABILITY", 0.9)
 
     # Warnings
-    max_warnings_per_operation: int = int(os.getenv("MAX_WARNINGS_PER_OPERATION", "10"))
-    warning_probability_per_tick: float = float(os.getenv("WARNING_PROBABILITY_PER_TICK", "0.2"))
-    seed_warning_probability_per_completed_operation: float = float(
-        os.getenv("SEED_WARNING_PROBABILITY_PER_COMPLETED_OPERATION", "0.2")
+    max_warnings_per_operation: int = env_int("MAX_WARNINGS_PER_OPERATION", 10)
+    warning_probability_per_tick: float = env_float("WARNING_PROBABILITY_PER_TICK", 0.2)
+    seed_warning_probability_per_completed_operation: float = env_float(
+        "SEED_WARNING_PROBABILITY_PER_COMPLETED_OPERATION", 0.2
     )
 
     # Gap between operations range (minutes)
@@ -61,6 +84,6 @@ class SimulationConfig:
     max_gap_duration: int = 10
 
     # Demo seeding
-    seed_past_heats: int = int(os.getenv("DEMO_SEED_PAST_HEATS", "4"))
-    seed_active_heats: int = int(os.getenv("DEMO_SEED_ACTIVE_HEATS", "2"))
-    seed_future_heats: int = int(os.getenv("DEMO_SEED_FUTURE_HEATS", "4"))
+    seed_past_heats: int = env_int("DEMO_SEED_PAST_HEATS", 4)
+    seed_active_heats: int = env_int("DEMO_SEED_ACTIVE_HEATS", 2)
+    seed_future_heats: int = env_int("DEMO_SEED_FUTURE_HEATS", 4)
@@ -5,16 +5,16 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
-from ..config import EQUIPMENT, PROCESS_FLOW, ProcessStatus, SimulationConfig
+from ..config import PROC_CD_BY_STEP, PROCESS_FLOW, PROCESS_FLOW_IDX, STEP_BY_PROC_CD, ProcessStatus, SimulationConfig
 from ..utils import CST
 
 if TYPE_CHECKING:
     from ..events import EventEngine
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OperationProcessorContext:
     db: Any
     config: SimulationConfig
@@ -31,9 +31,11 @@ class OperationProcessor:
     def __init__(self, ctx: OperationProcessorContext):
         self.ctx = ctx
 
-    def process_active_operations(self) -> None:
-        active_ops = self.ctx.db.get_active_operations()
+    def process_active_operations(self, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        if active_ops is None:
+            active_ops = self.ctx.db.get_active_operations()
         now = datetime.now(CST)
+        completed: List[Dict[str, Any]] = []
 
         for op in active_ops:
             if op.get("real_start_time"):
@@ -49,9 +51,18 @@ class OperationProcessor:
                         should_complete = random.random() < (0.3 + 0.7 * progress)
 
                     if should_complete:
-                        self._complete_operation(op, now)
-
-    def _complete_operation(self, operation: Dict[str, Any], completion_time: datetime) -> None:
+                        self._finish_operation(op, now)
+                        completed.append({
+                            "operation_id": op["id"],
+                            "proc_status": ProcessStatus.COMPLETED,
+                            "real_end_time": now,
+                        })
+
+        # Completions are independent of each other; write them in one statement.
+        self.ctx.db.update_operations_status_batch(completed)
+
+    def _finish_operation(self, operation: Dict[str, Any], completion_time: datetime) -> None:
+        """Log the completion and emit its end sequence events (no status write)."""
         self.ctx.logger.info(
             "Completing operation %s for heat %s (%s)",
             operation["id"],
@@ -63,25 +74,15 @@ class OperationProcessor:
         if self.ctx.events:
             self.ctx.events.emit_end_sequence_events(operation, completion_time)
 
-        self.ctx.db.update_operation_status(
-            operation_id=operation["id"],
-            proc_status=ProcessStatus.COMPLETED,
-            real_end_time=completion_time,
-        )
-
-    def process_pending_operations(self) -> None:
-        pending_ops = self.ctx.db.get_pending_operations()
+    def process_pending_operations(self, pending_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        if pending_ops is None:
+            pending_ops = self.ctx.db.get_pending_operations()
         now = datetime.now(CST)
 
         for op in pending_ops:
             heat_ops = self.ctx.db.get_heat_operations(op["heat_no"])
 
-            current_proc_idx = None
-            for i, proc_name in enumerate(PROCESS_FLOW):
-                if EQUIPMENT[proc_name]["proc_cd"] == op["proc_cd"]:
-                    current_proc_idx = i
-                    break
-
+            current_proc_idx = PROCESS_FLOW_IDX.get(STEP_BY_PROC_CD.get(op["proc_cd"]))
             if current_proc_idx is None:
                 continue
 
@@ -126,7 +127,7 @@ class OperationProcessor:
                 continue
 
             prev_proc_name = PROCESS_FLOW[current_proc_idx - 1]
-            prev_proc_cd = EQUIPMENT[prev_proc_name]["proc_cd"]
+            prev_proc_cd = PROC_CD_BY_STEP[prev_proc_name]
             prev_op = next((h for h in heat_ops if h["proc_cd"] == prev_proc_cd), None)
 
             if not (prev_op and prev_op["proc_status"] == ProcessStatus.COMPLETED and prev_op["real_end_time"]):
@@ -3,13 +3,12 @@
 import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any
 
-from ..config import SimulationConfig, EQUIPMENT, ProcessStatus
-from ..utils import CST
+from ..config import SimulationConfig, DEVICES_BY_STEP
 
 
-@dataclass
+@dataclass(slots=True)
 class Slot:
     device_no: str
     plan_start: datetime
@@ -23,28 +22,6 @@ class DeviceScheduler:
         self.db = db
         self.config = config
 
-    def _normalize_window(self, row: Dict[str, Any], *, include_pending_plans: bool) -> Optional[tuple]:
-        """Convert a DB row into a (start, end) tuple.
-
-        When `include_pending_plans` is False, ignore windows that exist only as
-        *plans* (pending ops with no real start). This is important at runtime:
-        planned future rows should not block starting a ready operation; they
-        will naturally shift in real time if upstream delays occur.
-        """
-        if not include_pending_plans and row.get("proc_status") == ProcessStatus.PENDING and not row.get("real_start_time"):
-            return None
-
-        start = row["real_start_time"] or row["plan_start_time"]
-        end = row["real_end_time"] or row["plan_end_time"]
-        if not start:
-            return None
-
-        if end is None:
-            # Fallback for malformed rows: assume worst-case duration.
-            end = start + timedelta(minutes=self.config.max_operation_duration)
-
-        return (start, end)
-
     def _get_device_windows(
         self,
         device_no: str,
@@ -53,16 +30,19 @@ class DeviceScheduler:
         *,
         include_pending_plans: bool,
     ) -> List[tuple]:
-        """Fetch and sort windows around the desired start."""
-        lookback_start = datetime.min.replace(tzinfo=CST)
-        rows = self.db.get_device_operation_windows(device_no, lookback_start, exclude_operation_id)
-        windows: List[tuple] = []
-        for row in rows:
-            normalized = self._normalize_window(row, include_pending_plans=include_pending_plans)
-            if normalized:
-                windows.append(normalized)
-        windows.sort(key=lambda w: w[0])
-        return windows
+        """Fetch (start, end) windows on a device that can affect a slot at `desired_start`.
+
+        When `include_pending_plans` is False, ignore windows that exist only as
+        *plans* (pending ops with no real start). This is important at runtime:
+        planned future rows should not block starting a ready operation; they
+        will naturally shift in real time if upstream delays occur.
+        """
+        return self.db.get_device_busy_windows(
+            device_no,
+            desired_start,
+            exclude_operation_id,
+            include_pending_plans=include_pending_plans,
+        )
 
     def find_slot(
         self,
@@ -88,7 +68,7 @@ class DeviceScheduler:
         At runtime, longer idles must not deadlock the simulation; disable the
         upper bound by passing `enforce_max_rest=False`.
         """
-        proc_devices = devices if devices is not None else EQUIPMENT[process_name]["devices"]
+        proc_devices = devices if devices is not None else DEVICES_BY_STEP[process_name]
         max_rest = timedelta(minutes=self.config.max_rest_duration_minutes) if enforce_max_rest else None
         min_rest = timedelta(minutes=self.config.min_rest_duration_minutes)
 
@@ -18,11 +18,13 @@ from typing import Any, Dict, List, Optional
 from ..config import (
     CREW_CODES,
     DatabaseConfig,
-    EQUIPMENT,
+    DEVICES_BY_STEP,
+    PROC_CD_BY_STEP,
     PROCESS_FLOW,
     PRO_LINE_CD,
     ProcessStatus,
     SimulationConfig,
+    STEP_BY_PROC_CD,
 )
 from ..database import DatabaseManager
 from ..events import EventEngine
@@ -104,17 +106,13 @@ class SteelmakingSimulator:
         now = datetime.now(CST)
         self.seeder.reset_demo_data(now)
 
-        if not self.db.get_active_operations():
+        if not self.db.has_active_operations():
             # Fallback: ensure at least one active flow exists for demo readability.
             self._seed_forced_active_heat(now, start_time=now - timedelta(minutes=self.config.max_operation_duration))
 
     def generate_heat_no(self) -> int:
         now = datetime.now(CST)
-        year = now.year % 100
-        month = now.month
-        latest = self.db.get_latest_heat_no_for_month(year, month)
-        seq = (latest % 100000) + 1 if latest else 1
-        return int(f"{year:02d}{month:02d}{seq:05d}")
+        return self.db.allocate_heat_no(now.year % 100, now.month)
 
     def get_random_steel_grade(self) -> Dict[str, Any]:
         return random.choice(self.steel_grades)
@@ -133,24 +131,31 @@ class SteelmakingSimulator:
     def create_new_heat(self) -> Optional[int]:
         return self.planner.create_new_heat()
 
-    def process_active_operations(self) -> None:
-        self.processor.process_active_operations()
+    def process_active_operations(self, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.processor.process_active_operations(active_ops)
 
-    def process_pending_operations(self) -> None:
-        self.processor.process_pending_operations()
+    def process_pending_operations(self, pending_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.processor.process_pending_operations(pending_ops)
 
     def tick(self) -> None:
         logger.debug("Simulation tick...")
         now = datetime.now(CST)
-        self._tick_realtime_warnings(now)
-        self._tick_realtime_events(now)
-        self._tick_realtime_kpi_stats(now)
-
-        self.process_active_operations()
-        self.process_pending_operations()
-
-        if random.random() < self.config.new_heat_probability:
-            self.create_new_heat()
+        # One pinned session and a single COMMIT per tick; a failing tick
+        # leaves no partial progress behind.
+        with self.db.transaction():
+            # The realtime engines only append warnings/events/KPI samples, and
+            # completing an active operation never touches pending rows, so one
+            # snapshot of both sets serves the whole tick.
+            active_ops, pending_ops = self.db.get_active_and_pending_operations()
+            self._tick_realtime_warnings(now, active_ops)
+            self._tick_realtime_events(now, active_ops)
+            self._tick_realtime_kpi_stats(now, active_ops)
+
+            self.process_active_operations(active_ops)
+            self.process_pending_operations(pending_ops)
+
+            if random.random() < self.config.new_heat_probability:
+                self.create_new_heat()
 
     def run(self) -> None:
         import time
@@ -171,28 +176,25 @@ class SteelmakingSimulator:
     def _random_warning_duration_seconds(self) -> float:
         return self.warnings.random_warning_duration_seconds()
 
-    def _tick_realtime_warnings(self, now: datetime) -> None:
-        self.warnings.tick_realtime_warnings(now)
+    def _tick_realtime_warnings(self, now: datetime, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.warnings.tick_realtime_warnings(now, active_ops)
 
-    def _tick_realtime_events(self, now: datetime) -> None:
-        self.events.tick_realtime_events(now)
+    def _tick_realtime_events(self, now: datetime, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.events.tick_realtime_events(now, active_ops)
 
-    def _tick_realtime_kpi_stats(self, now: datetime) -> None:
-        self.kpi_stats.tick_realtime_kpi_stats(now)
+    def _tick_realtime_kpi_stats(self, now: datetime, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.kpi_stats.tick_realtime_kpi_stats(now, active_ops)
 
     # --- Internal helpers ---
 
     def _get_process_name(self, proc_cd: str) -> Optional[str]:
-        for name, info in EQUIPMENT.items():
-            if info["proc_cd"] == proc_cd:
-                return name
-        return None
+        return STEP_BY_PROC_CD.get(proc_cd)
 
     def _aligned_device(self, src_device_no: str, target_process_name: str) -> Optional[str]:
         if not src_device_no:
             return None
         suffix = src_device_no[-1]
-        for dev in EQUIPMENT[target_process_name]["devices"]:
+        for dev in DEVICES_BY_STEP[target_process_name]:
             if dev.endswith(suffix):
                 return dev
         return None
@@ -213,7 +215,7 @@ class SteelmakingSimulator:
                 desired_start=attempt_start,
                 latest_start=None,
                 duration=duration,
-                devices=EQUIPMENT["BOF"]["devices"],
+                devices=DEVICES_BY_STEP["BOF"],
             )
             if candidate and candidate.plan_start <= now < candidate.plan_end:
                 slot = candidate
@@ -229,7 +231,7 @@ class SteelmakingSimulator:
 
         planned_ops = [
             {
-                "proc_cd": EQUIPMENT["BOF"]["proc_cd"],
+                "proc_cd": PROC_CD_BY_STEP["BOF"],
                 "plan_start": slot.plan_start,
                 "plan_end": slot.plan_end,
                 "real_start": slot.plan_start,
@@ -241,7 +243,6 @@ class SteelmakingSimulator:
 
         current_plan_start = slot.plan_end + self.get_random_transfer_gap()
         for process_name in PROCESS_FLOW[1:]:
-            proc_info = EQUIPMENT[process_name]
             proc_duration = self.get_random_duration()
             latest_start = slot.plan_end + timedelta(minutes=self.config.max_transfer_gap_minutes)
             proc_slot = self.scheduler.find_slot(
@@ -249,13 +250,13 @@ class SteelmakingSimulator:
                 desired_start=current_plan_start,
                 latest_start=latest_start,
                 duration=proc_duration,
-                devices=proc_info["devices"],
+                devices=DEVICES_BY_STEP[process_name],
             )
             if not proc_slot:
                 break
             planned_ops.append(
                 {
-                    "proc_cd": proc_info["proc_cd"],
+                    "proc_cd": PROC_CD_BY_STEP[process_name],
                     "plan_start": proc_slot.plan_start,
                     "plan_end": proc_slot.plan_end,
                     "real_start": None,
@@ -266,18 +267,22 @@ class SteelmakingSimulator:
             )
             current_plan_start = proc_slot.plan_end + self.get_random_transfer_gap()
 
-        for op in planned_ops:
-            self.db.insert_operation(
-                heat_no=heat_no,
-                pro_line_cd=PRO_LINE_CD,
-                proc_cd=op["proc_cd"],
-                device_no=op["device_no"],
-                crew_cd=crew_cd,
-                stl_grd_id=steel_grade["id"],
-                stl_grd_cd=steel_grade["stl_grd_cd"],
-                proc_status=op["status"],
-                plan_start_time=op["plan_start"],
-                plan_end_time=op["plan_end"],
-                real_start_time=op["real_start"],
-                real_end_time=op["real_end"],
-            )
+        self.db.insert_operations_batch(
+            [
+                {
+                    "heat_no": heat_no,
+                    "pro_line_cd": PRO_LINE_CD,
+                    "proc_cd": op["proc_cd"],
+                    "device_no": op["device_no"],
+                    "crew_cd": crew_cd,
+                    "stl_grd_id": steel_grade["id"],
+                    "stl_grd_cd": steel_grade["stl_grd_cd"],
+                    "proc_status": op["status"],
+                    "plan_start_time": op["plan_start"],
+                    "plan_end_time": op["plan_end"],
+                    "real_start_time": op["real_start"],
+                    "real_end_time": op["real_end"],
+                }
+                for op in planned_ops
+            ]
+        )
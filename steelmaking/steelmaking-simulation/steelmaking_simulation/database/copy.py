@@ -0,0 +1,52 @@
+"""COPY FROM STDIN helpers for bulk loads."""
+
+import io
+from functools import lru_cache
+from datetime import datetime
+from typing import Any, Iterable, Sequence, Tuple
+
+from .jsonb import jsonb_param
+
+# Batches smaller than this go through execute_values; COPY only pays off
+# once the per-statement overhead is amortized over enough rows.
+COPY_MIN_ROWS = 500
+
+# execute_values page size. It is at least COPY_MIN_ROWS, so any batch that
+# stays on the INSERT path goes out as a single statement; the psycopg2
+# default of 100 would split it into several round trips.
+INSERT_PAGE_SIZE = 1000
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a Python value as a field of PostgreSQL's text COPY format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        text = value.isoformat(sep=" ")
+    elif isinstance(value, (dict, list)):
+        text = jsonb_param(value)
+    else:
+        text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def format_copy_rows(rows: Iterable[Sequence[Any]]) -> str:
+    """Serialize rows into a tab-separated COPY text payload."""
+    return "".join("\t".join(_copy_value(v) for v in row) + "\n" for row in rows)
+
+
+@lru_cache(maxsize=None)
+def _copy_statement(table: str, columns: Tuple[str, ...]) -> str:
+    """Build (once per table/column list) the COPY FROM STDIN statement."""
+    return f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+
+
+def copy_rows(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    """Stream rows into `table` with a single COPY FROM STDIN."""
+    buf = io.StringIO(format_copy_rows(rows))
+    cur.copy_expert(_copy_statement(table, tuple(columns)), buf)
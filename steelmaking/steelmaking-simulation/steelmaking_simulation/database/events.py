@@ -1,9 +1,74 @@
 """Event-related database queries."""
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from psycopg2.extras import Json, execute_values
+from psycopg2.extras import DictCursor, execute_values
+
+from .copy import COPY_MIN_ROWS, INSERT_PAGE_SIZE, copy_rows
+from .jsonb import jsonb_param
+
+
+# Server-side prepared statements (name -> parameter types and body), registered
+# once per connection by DatabaseManager and invoked with EXECUTE.
+PREPARED_STATEMENTS = {
+    "event_insert": """
+        (bigint, text, text, text, text, text, text, timestamptz, timestamptz, jsonb) AS
+        INSERT INTO steelmaking.steelmaking_event (
+            heat_no, pro_line_cd, proc_cd, device_no,
+            event_code, event_name, event_msg, event_time_start, event_time_end, extra
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        RETURNING id
+    """,
+    "event_window_stats": """
+        (bigint, text, text, timestamptz, timestamptz) AS
+        SELECT COUNT(*) AS n, MAX(event_time_start) AS last_time
+        FROM steelmaking.steelmaking_event
+        WHERE heat_no = $1
+          AND proc_cd = $2
+          AND device_no = $3
+          AND event_time_start >= $4
+          AND event_time_start <= $5
+    """,
+    "event_window_stats_batch": """
+        (bigint[], text[], text[], timestamptz[], timestamptz[]) AS
+        SELECT s.n, s.last_time
+        FROM unnest($1, $2, $3, $4, $5) WITH ORDINALITY
+             AS w(heat_no, proc_cd, device_no, window_start, window_end, ord)
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS n, MAX(e.event_time_start) AS last_time
+            FROM steelmaking.steelmaking_event e
+            WHERE e.heat_no = w.heat_no
+              AND e.proc_cd = w.proc_cd
+              AND e.device_no = w.device_no
+              AND e.event_time_start >= w.window_start
+              AND e.event_time_start <= w.window_end
+        ) s
+        ORDER BY w.ord
+    """,
+    "event_window_list": """
+        (bigint, text, text, timestamptz, timestamptz) AS
+        SELECT id, event_code, event_name, event_msg, event_time_start, event_time_end
+        FROM steelmaking.steelmaking_event
+        WHERE heat_no = $1
+          AND proc_cd = $2
+          AND device_no = $3
+          AND event_time_start >= $4
+          AND event_time_start <= $5
+        ORDER BY event_time_start
+    """,
+}
+
+EVENT_COLUMNS = (
+    "heat_no", "pro_line_cd", "proc_cd", "device_no",
+    "event_code", "event_name", "event_msg",
+    "event_time_start", "event_time_end", "extra",
+)
+
+_INSERT_EVENTS_SQL = (
+    f"INSERT INTO steelmaking.steelmaking_event ({', '.join(EVENT_COLUMNS)}) VALUES %s"
+)
 
 
 class EventQueries:
@@ -25,16 +90,9 @@ class EventQueries:
         extra: Optional[Dict[str, Any]] = None,
     ) -> int:
         """Insert a steelmaking event."""
-        with db.cursor() as cur:
+        with db.cursor(cursor_factory=None) as cur:
             cur.execute(
-                """
-                INSERT INTO steelmaking.steelmaking_event (
-                    heat_no, pro_line_cd, proc_cd, device_no,
-                    event_code, event_name, event_msg, event_time_start, event_time_end, extra
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-                """,
+                "EXECUTE event_insert (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
                 (
                     heat_no,
                     pro_line_cd,
@@ -45,11 +103,10 @@ class EventQueries:
                     event_msg,
                     event_time_start,
                     event_time_end,
-                    Json(extra) if extra is not None else None,
+                    jsonb_param(extra),
                 ),
             )
-            result = cur.fetchone()
-            return result["id"]
+            return cur.fetchone()[0]
 
     @staticmethod
     def insert_events_batch(
@@ -57,49 +114,54 @@ class EventQueries:
         events: List[Dict[str, Any]],
     ) -> int:
         """Insert multiple events in a batch.
-        
+
+        Large batches (e.g. a whole seeding pass) are streamed with COPY;
+        smaller ones use a multi-row INSERT.
+
         Args:
             events: List of event dictionaries with keys:
                 heat_no, pro_line_cd, proc_cd, device_no,
                 event_code, event_name, event_msg, event_time_start, event_time_end, extra
-                
+
         Returns:
             Number of events inserted
         """
         if not events:
             return 0
-        
+
+        rows = [
+            (
+                e["heat_no"],
+                e["pro_line_cd"],
+                e["proc_cd"],
+                e["device_no"],
+                e["event_code"],
+                e["event_name"],
+                e["event_msg"],
+                e["event_time_start"],
+                e["event_time_end"],
+                e.get("extra"),
+            )
+            for e in events
+        ]
+
         with db.cursor() as cur:
-            values = []
-            for e in events:
-                values.append((
-                    e["heat_no"],
-                    e["pro_line_cd"],
-                    e["proc_cd"],
-                    e["device_no"],
-                    e["event_code"],
-                    e["event_name"],
-                    e["event_msg"],
-                    e["event_time_start"],
-                    e["event_time_end"],
-                    Json(e.get("extra")) if e.get("extra") is not None else None,
-                ))
-            
-            execute_values(
-                cur,
-                """
-                INSERT INTO steelmaking.steelmaking_event (
-                    heat_no, pro_line_cd, proc_cd, device_no,
-                    event_code, event_name, event_msg, event_time_start, event_time_end, extra
+            if len(rows) >= COPY_MIN_ROWS:
+                copy_rows(cur, "steelmaking.steelmaking_event", EVENT_COLUMNS, rows)
+            else:
+                execute_values(
+                    cur,
+                    _INSERT_EVENTS_SQL,
+                    [
+                        row[:-1] + (jsonb_param(row[-1]),)
+                        for row in rows
+                    ],
+                    page_size=INSERT_PAGE_SIZE,
                 )
-                VALUES %s
-                """,
-                values,
-            )
-            return len(values)
+            return len(rows)
 
     @staticmethod
-    def get_operation_event_count(
+    def get_operation_event_stats(
         db,
         *,
         heat_no: int,
@@ -107,23 +169,63 @@ class EventQueries:
         device_no: str,
         window_start: datetime,
         window_end: datetime,
-    ) -> int:
-        """Return number of events already emitted within an operation window."""
-        with db.cursor() as cur:
+    ) -> Tuple[int, Optional[datetime]]:
+        """Return (event count, latest event_time_start) for an operation window.
+
+        Both aggregates come from the same rows, so one query answers both.
+        """
+        with db.read_cursor(cursor_factory=None) as cur:
             cur.execute(
-                """
-                SELECT COUNT(*) AS n
-                FROM steelmaking.steelmaking_event
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND event_time_start >= %s
-                  AND event_time_start <= %s
-                """,
+                "EXECUTE event_window_stats (%s, %s, %s, %s, %s)",
                 (heat_no, proc_cd, device_no, window_start, window_end),
             )
             row = cur.fetchone()
-            return int(row["n"]) if row else 0
+            return (int(row[0]), row[1]) if row else (0, None)
+
+    @staticmethod
+    def get_operations_event_stats(
+        db,
+        windows: List[Tuple[int, str, str, datetime, datetime]],
+    ) -> List[Tuple[int, Optional[datetime]]]:
+        """Return get_operation_event_stats for several operation windows at once.
+
+        Args:
+            windows: (heat_no, proc_cd, device_no, window_start, window_end) tuples
+
+        Returns:
+            (event count, latest event_time_start) per window, in input order
+        """
+        if not windows:
+            return []
+
+        heat_nos, proc_cds, device_nos, starts, ends = (list(column) for column in zip(*windows))
+        with db.read_cursor(cursor_factory=None) as cur:
+            cur.execute(
+                "EXECUTE event_window_stats_batch "
+                "(%s::bigint[], %s::text[], %s::text[], %s::timestamptz[], %s::timestamptz[])",
+                (heat_nos, proc_cds, device_nos, starts, ends),
+            )
+            return [(int(n), last_time) for n, last_time in cur.fetchall()]
+
+    @staticmethod
+    def get_operation_event_count(
+        db,
+        *,
+        heat_no: int,
+        proc_cd: str,
+        device_no: str,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> int:
+        """Return number of events already emitted within an operation window."""
+        return EventQueries.get_operation_event_stats(
+            db,
+            heat_no=heat_no,
+            proc_cd=proc_cd,
+            device_no=device_no,
+            window_start=window_start,
+            window_end=window_end,
+        )[0]
 
     @staticmethod
     def get_operation_last_event_time(
@@ -134,23 +236,16 @@ class EventQueries:
         device_no: str,
         window_start: datetime,
         window_end: datetime,
-    ):
+    ) -> Optional[datetime]:
         """Return the latest event_time_start for an operation window, or None."""
-        with db.cursor() as cur:
-            cur.execute(
-                """
-                SELECT MAX(event_time_start) AS last_time
-                FROM steelmaking.steelmaking_event
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND event_time_start >= %s
-                  AND event_time_start <= %s
-                """,
-                (heat_no, proc_cd, device_no, window_start, window_end),
-            )
-            row = cur.fetchone()
-            return row["last_time"] if row else None
+        return EventQueries.get_operation_event_stats(
+            db,
+            heat_no=heat_no,
+            proc_cd=proc_cd,
+            device_no=device_no,
+            window_start=window_start,
+            window_end=window_end,
+        )[1]
 
     @staticmethod
     def get_operation_events(
@@ -162,19 +257,14 @@ class EventQueries:
         window_start: datetime,
         window_end: datetime,
     ) -> List[Dict[str, Any]]:
-        """Return all events for an operation within the given time window."""
-        with db.cursor() as cur:
+        """Return all events for an operation within the given time window.
+
+        Rows are DictCursor rows (values plus the cursor's shared column
+        index), read by key like the event dicts the engine builds.
+        """
+        with db.read_cursor(cursor_factory=DictCursor) as cur:
             cur.execute(
-                """
-                SELECT id, event_code, event_name, event_msg, event_time_start, event_time_end
-                FROM steelmaking.steelmaking_event
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND event_time_start >= %s
-                  AND event_time_start <= %s
-                ORDER BY event_time_start
-                """,
+                "EXECUTE event_window_list (%s, %s, %s, %s, %s)",
                 (heat_no, proc_cd, device_no, window_start, window_end),
             )
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
@@ -0,0 +1,33 @@
+"""JSONB parameter encoding."""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def jsonb_param(value: Any) -> Optional[str]:
+    """Serialize `value` for a jsonb parameter, or None for SQL NULL.
+
+    The compact text is bound as a plain string and cast by the jsonb column
+    or prepared-statement parameter, instead of wrapping every row in
+    psycopg2's Json adapter, which serializes again at bind time.
+    """
+    return None if value is None else _encode(value)
+
+
+def jsonb_params(values: Iterable[Any]) -> List[Optional[str]]:
+    """Encode a column of jsonb values, serializing each distinct object once.
+
+    Batch rows often share one dict object (every KPI sample of an operation
+    tick carries the same `extra`), so results are memoized by identity. The
+    memo keeps each object alive, so an id cannot be reused mid-call.
+    """
+    encoded: Dict[int, Tuple[Any, Optional[str]]] = {}
+    out = []
+    for value in values:
+        entry = encoded.get(id(value))
+        if entry is None:
+            entry = encoded[id(value)] = (value, jsonb_param(value))
+        out.append(entry[1])
+    return out
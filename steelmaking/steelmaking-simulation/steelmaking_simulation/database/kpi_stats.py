@@ -1,9 +1,75 @@
 """Database queries for KPI statistics."""
 
+from collections import defaultdict
 from typing import Any, Dict, List, Optional
 from decimal import Decimal
 
-from psycopg2.extras import Json
+from psycopg2.extras import execute_values
+
+from .copy import COPY_MIN_ROWS, INSERT_PAGE_SIZE, copy_rows
+from .jsonb import jsonb_param, jsonb_params
+
+
+# Server-side prepared statements (name -> parameter types and body), registered
+# once per connection by DatabaseManager and invoked with EXECUTE.
+PREPARED_STATEMENTS = {
+    "kpi_stat_insert": """
+        (bigint, text, text, text, text, numeric, timestamptz, jsonb) AS
+        INSERT INTO steelmaking.steelmaking_kpi_stats
+            (heat_no, pro_line_cd, proc_cd, device_no, kpi_code, stat_value, sample_time, extra)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+        RETURNING id
+    """,
+}
+
+# Window reads below have no hot caller, so they are sent as plain SQL rather
+# than prepared on every pooled session.
+_KPI_WINDOW_COUNT_SQL = """
+SELECT COUNT(*)
+FROM steelmaking.steelmaking_kpi_stats
+WHERE heat_no = %s
+  AND proc_cd = %s
+  AND device_no = %s
+  AND sample_time >= %s
+  AND sample_time <= %s
+"""
+
+_KPI_WINDOW_LAST_SAMPLE_SQL = """
+SELECT MAX(sample_time)
+FROM steelmaking.steelmaking_kpi_stats
+WHERE heat_no = %s
+  AND proc_cd = %s
+  AND device_no = %s
+  AND sample_time >= %s
+  AND sample_time <= %s
+"""
+
+
+# Column list shared by the KPI definition reads.
+_KPI_DEF_COLUMNS = "kpi_code, kpi_name, unit, int_digits, decimal_digits, upper_limit, lower_limit"
+
+_KPI_DEFS_FOR_PROC_SQL = f"""
+SELECT {_KPI_DEF_COLUMNS}
+FROM steelmaking.steelmaking_kpi_def
+WHERE proc_cd = %s AND display_enabled = true
+ORDER BY display_order
+"""
+
+_ALL_KPI_DEFS_SQL = f"""
+SELECT proc_cd, {_KPI_DEF_COLUMNS}
+FROM steelmaking.steelmaking_kpi_def
+WHERE display_enabled = true
+ORDER BY proc_cd, display_order
+"""
+
+KPI_STATS_COLUMNS = (
+    "heat_no", "pro_line_cd", "proc_cd", "device_no",
+    "kpi_code", "stat_value", "sample_time", "extra",
+)
+
+_INSERT_KPI_STATS_SQL = (
+    f"INSERT INTO steelmaking.steelmaking_kpi_stats ({', '.join(KPI_STATS_COLUMNS)}) VALUES %s"
+)
 
 
 class KpiStatsQueries:
@@ -27,16 +93,9 @@ class KpiStatsQueries:
             - upper_limit: Upper limit for value range
             - lower_limit: Lower limit for value range
         """
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT kpi_code, kpi_name, unit, 
-                       int_digits, decimal_digits, 
-                       upper_limit, lower_limit
-                FROM steelmaking.steelmaking_kpi_def
-                WHERE proc_cd = %s AND display_enabled = true
-                ORDER BY display_order
-            """, (proc_cd,))
-            return [dict(row) for row in cur.fetchall()]
+        with db.read_cursor() as cur:
+            cur.execute(_KPI_DEFS_FOR_PROC_SQL, (proc_cd,))
+            return cur.fetchall()
     
     @staticmethod
     def get_all_kpi_definitions(db) -> Dict[str, List[Dict[str, Any]]]:
@@ -48,24 +107,15 @@ class KpiStatsQueries:
         Returns:
             Dict mapping proc_cd to list of KPI definitions
         """
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT proc_cd, kpi_code, kpi_name, unit, 
-                       int_digits, decimal_digits, 
-                       upper_limit, lower_limit
-                FROM steelmaking.steelmaking_kpi_def
-                WHERE display_enabled = true
-                ORDER BY proc_cd, display_order
-            """)
+        with db.read_cursor() as cur:
+            cur.execute(_ALL_KPI_DEFS_SQL)
             rows = cur.fetchall()
         
-        result: Dict[str, List[Dict[str, Any]]] = {}
+        result: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         for row in rows:
-            proc_cd = row["proc_cd"]
-            if proc_cd not in result:
-                result[proc_cd] = []
-            result[proc_cd].append(dict(row))
-        return result
+            result[row["proc_cd"]].append(row)
+        # Plain dict, so lookups of unknown codes do not insert empty lists.
+        return dict(result)
     
     @staticmethod
     def insert_kpi_stat(
@@ -96,20 +146,20 @@ class KpiStatsQueries:
         Returns:
             ID of the inserted record
         """
-        with db.cursor() as cur:
+        with db.cursor(cursor_factory=None) as cur:
             cur.execute("""
-                INSERT INTO steelmaking.steelmaking_kpi_stats 
-                    (heat_no, pro_line_cd, proc_cd, device_no, kpi_code, stat_value, sample_time, extra)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
+                EXECUTE kpi_stat_insert (%s, %s, %s, %s, %s, %s, %s, %s)
             """, (heat_no, pro_line_cd, proc_cd, device_no, kpi_code, stat_value, sample_time,
-                  Json(extra) if extra is not None else None))
-            return cur.fetchone()["id"]
+                  jsonb_param(extra)))
+            return cur.fetchone()[0]
     
     @staticmethod
     def insert_kpi_stats_batch(db, stats: List[Dict[str, Any]]) -> int:
         """Insert multiple KPI statistics records in a batch.
         
+        Large batches (e.g. a whole seeding pass) are streamed with COPY;
+        smaller ones use a multi-row INSERT.
+        
         Args:
             db: Database manager instance
             stats: List of stat dicts with keys matching insert_kpi_stat params
@@ -120,33 +170,27 @@ class KpiStatsQueries:
         if not stats:
             return 0
         
-        with db.cursor() as cur:
-            from psycopg2.extras import execute_values
-            
-            values = [
-                (
-                    s["heat_no"],
-                    s["pro_line_cd"],
-                    s["proc_cd"],
-                    s["device_no"],
-                    s["kpi_code"],
-                    s.get("stat_value"),
-                    s["sample_time"],
-                    Json(s.get("extra")) if s.get("extra") is not None else None,
-                )
-                for s in stats
-            ]
-            
-            execute_values(
-                cur,
-                """
-                INSERT INTO steelmaking.steelmaking_kpi_stats 
-                    (heat_no, pro_line_cd, proc_cd, device_no, kpi_code, stat_value, sample_time, extra)
-                VALUES %s
-                """,
-                values,
+        extras = jsonb_params(s.get("extra") for s in stats)
+        rows = [
+            (
+                s["heat_no"],
+                s["pro_line_cd"],
+                s["proc_cd"],
+                s["device_no"],
+                s["kpi_code"],
+                s.get("stat_value"),
+                s["sample_time"],
+                extra,
             )
-            return len(values)
+            for s, extra in zip(stats, extras)
+        ]
+        
+        with db.cursor() as cur:
+            if len(rows) >= COPY_MIN_ROWS:
+                copy_rows(cur, "steelmaking.steelmaking_kpi_stats", KPI_STATS_COLUMNS, rows)
+            else:
+                execute_values(cur, _INSERT_KPI_STATS_SQL, rows, page_size=INSERT_PAGE_SIZE)
+            return len(rows)
     
     @staticmethod
     def get_operation_kpi_stats_count(
@@ -171,17 +215,12 @@ class KpiStatsQueries:
         Returns:
             Number of KPI stat records
         """
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT COUNT(*) as cnt
-                FROM steelmaking.steelmaking_kpi_stats
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND sample_time >= %s
-                  AND sample_time <= %s
-            """, (heat_no, proc_cd, device_no, window_start, window_end))
-            return cur.fetchone()["cnt"]
+        with db.read_cursor(cursor_factory=None) as cur:
+            cur.execute(
+                _KPI_WINDOW_COUNT_SQL,
+                (heat_no, proc_cd, device_no, window_start, window_end),
+            )
+            return cur.fetchone()[0]
     
     @staticmethod
     def get_operation_last_kpi_sample_time(
@@ -206,18 +245,13 @@ class KpiStatsQueries:
         Returns:
             Latest sample_time or None
         """
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT MAX(sample_time) as last_time
-                FROM steelmaking.steelmaking_kpi_stats
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND sample_time >= %s
-                  AND sample_time <= %s
-            """, (heat_no, proc_cd, device_no, window_start, window_end))
+        with db.read_cursor(cursor_factory=None) as cur:
+            cur.execute(
+                _KPI_WINDOW_LAST_SAMPLE_SQL,
+                (heat_no, proc_cd, device_no, window_start, window_end),
+            )
             row = cur.fetchone()
-            return row["last_time"] if row else None
+            return row[0] if row else None
     
     @staticmethod
     def clear_kpi_stats(db) -> None:
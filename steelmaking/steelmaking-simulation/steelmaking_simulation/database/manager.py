@@ -1,11 +1,59 @@
 """Database connection manager for steelmaking simulation."""
 
+import threading
+import time
+
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from contextlib import contextmanager
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..config import DatabaseConfig
+from .operations import PREPARED_STATEMENTS as OPERATION_STATEMENTS, OperationQueries
+from .warnings import PREPARED_STATEMENTS as WARNING_STATEMENTS, WarningQueries
+from .events import PREPARED_STATEMENTS as EVENT_STATEMENTS, EventQueries
+from .kpi_stats import PREPARED_STATEMENTS as KPI_STATEMENTS, KpiStatsQueries
+
+PREPARED_STATEMENTS = {
+    **OPERATION_STATEMENTS,
+    **WARNING_STATEMENTS,
+    **EVENT_STATEMENTS,
+    **KPI_STATEMENTS,
+}
+
+# Session settings applied while bulk seeding; reset before the session is
+# returned to the pool, server-global defaults are never touched.
+BULK_SESSION_SETTINGS = {
+    "synchronous_commit": "off",
+    "work_mem": "64MB",
+}
+
+# base.steel_grade is a static dimension table; reload it at most this often.
+STEEL_GRADES_TTL_SECONDS = 300.0
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """Pool connection that remembers whether its session is prepared.
+
+    It also keeps one client-side cursor per row factory, so the query helpers
+    re-execute on an existing cursor instead of allocating one per call. The
+    pool hands a connection to one borrower at a time, which keeps this safe.
+    """
+
+    statements_prepared = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursors = {}
+
+    def reusable_cursor(self, cursor_factory):
+        """Return this session's long-lived cursor for ``cursor_factory``."""
+        cursor = self._cursors.get(cursor_factory)
+        if cursor is None or cursor.closed:
+            cursor = self._cursors[cursor_factory] = self.cursor(cursor_factory=cursor_factory)
+        return cursor
 
 
 class DatabaseManager:
@@ -13,123 +61,352 @@ class DatabaseManager:
     
     This class provides the core database connectivity and inherits
     query methods from mixin classes for operations, warnings, and events.
+    Connections are borrowed from a small thread-safe pool, so callers
+    never pay for a new backend session per query.
     """
 
     def __init__(self, config: DatabaseConfig):
         self.config = config
-        self._connection = None
-
-    def connect(self):
-        """Establish database connection."""
-        if self._connection is None or self._connection.closed:
-            self._connection = psycopg2.connect(self.config.connection_string)
-            self._connection.autocommit = False
-        return self._connection
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._steel_grades = None
+        self._heat_sequences = set()
+        self._steel_grades_loaded_at = 0.0
+
+    def connect(self) -> ThreadedConnectionPool:
+        """Open the connection pool (no-op when it is already open)."""
+        pool = self._pool
+        if pool is not None and not pool.closed:
+            return pool
+        with self._pool_lock:
+            if self._pool is None or self._pool.closed:
+                self._pool = ThreadedConnectionPool(
+                    self.config.pool_min_conn,
+                    self.config.pool_max_conn,
+                    **self.config.connect_kwargs(),
+                    connection_factory=_PooledConnection,
+                )
+            return self._pool
+
+    @staticmethod
+    def _prepare_statements(conn) -> None:
+        """Register the hot-path prepared statements on a fresh session.
+
+        Prepared statements live for the whole session, so the server parses
+        and plans each of them once instead of on every call.
+        """
+        with conn.cursor() as cur:
+            for name, body in PREPARED_STATEMENTS.items():
+                cur.execute(f"PREPARE {name} {body}")
+        conn.commit()
+        conn.statements_prepared = True
 
     def close(self):
-        """Close database connection."""
-        if self._connection and not self._connection.closed:
-            self._connection.close()
+        """Close every pooled connection."""
+        if self._pool is not None and not self._pool.closed:
+            self._pool.closeall()
+
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     @contextmanager
-    def cursor(self):
-        """Context manager for database cursor."""
-        conn = self.connect()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+    def get_conn(self):
+        """Borrow a connection from the pool and return it when done.
+
+        Hot-path statements are prepared the first time a session is handed
+        out; any transaction left open is rolled back by the pool on return.
+        """
+        pinned = getattr(self._local, "conn", None)
+        if pinned is not None:
+            yield pinned
+            return
+
+        pool = self.connect()
+        conn = pool.getconn()
         try:
-            yield cursor
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
+            if not conn.statements_prepared:
+                self._prepare_statements(conn)
+            yield conn
         finally:
-            cursor.close()
+            pool.putconn(conn)
 
-    def get_steel_grades(self) -> List[Dict[str, Any]]:
-        """Fetch all steel grades from the database."""
-        with self.cursor() as cur:
-            cur.execute("SELECT id, stl_grd_cd, stl_grd_nm FROM base.steel_grade")
-            return cur.fetchall()
+    @contextmanager
+    def bulk_session(self):
+        """Pin one pooled session with bulk-write settings for the block.
+
+        Every cursor opened by this thread inside the block reuses the pinned
+        session. ``synchronous_commit`` is off there, so a server crash can
+        lose the last few commits; that is acceptable for demo seeding, which
+        truncates and regenerates everything on the next start.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+
+        with self.get_conn() as conn:
+            with conn.cursor() as cur:
+                for name, value in BULK_SESSION_SETTINGS.items():
+                    cur.execute(f"SET {name} = %s", (value,))
+            conn.commit()
+            self._local.conn = conn
+            try:
+                yield
+            finally:
+                self._local.conn = None
+                conn.rollback()
+                with conn.cursor() as cur:
+                    for name in BULK_SESSION_SETTINGS:
+                        cur.execute(f"RESET {name}")
+                conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Run every query of this thread inside the block as one transaction.
+
+        A pooled session is pinned for the block and the per-cursor commits
+        are deferred to a single COMMIT at the end; any exception rolls the
+        whole block back. A query that fails inside the block also fails the
+        block, even when its caller catches the error: the first such error
+        is re-raised at the end instead of committing a partial block. Reads
+        inside the block see its own writes. Nested use (or use inside
+        ``bulk_session``) joins the outer session.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+
+        with self.get_conn() as conn:
+            self._local.conn = conn
+            self._local.deferred_commit = True
+            self._local.deferred_error = None
+            self._local.created_heat_sequences = set()
+            try:
+                yield
+                if self._local.deferred_error is not None:
+                    raise self._local.deferred_error
+                conn.commit()
+                self._heat_sequences |= self._local.created_heat_sequences
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._local.conn = None
+                self._local.deferred_commit = False
+                self._local.deferred_error = None
+                self._local.created_heat_sequences = None
+
+    def _fail_deferred(self, error: Exception) -> bool:
+        """Record a query error inside ``transaction()``; False outside one.
+
+        The session is left in its failed state for ``transaction()`` to roll
+        back, so later statements in the block cannot commit on their own.
+        """
+        if not getattr(self._local, "deferred_commit", False):
+            return False
+        if self._local.deferred_error is None:
+            self._local.deferred_error = error
+        return True
+
+    @contextmanager
+    def cursor(self, cursor_factory=RealDictCursor):
+        """Context manager for database cursor.
+
+        Rows come back as dicts by default; pass ``cursor_factory=None`` for
+        plain tuples on hot paths that read scalars or ids positionally.
+        """
+        with self.get_conn() as conn:
+            cursor = conn.reusable_cursor(cursor_factory)
+            try:
+                yield cursor
+                if not getattr(self._local, "deferred_commit", False):
+                    conn.commit()
+            except Exception as e:
+                if not self._fail_deferred(e):
+                    conn.rollback()
+                raise e
+
+    @contextmanager
+    def read_cursor(self, cursor_factory=RealDictCursor):
+        """Context manager for a cursor that only reads.
+
+        The borrowed session runs in autocommit for the block, so a SELECT is
+        a single round-trip with no BEGIN/COMMIT around it. Inside
+        ``bulk_session`` the pinned session keeps its transaction mode.
+        """
+        with self.get_conn() as conn:
+            autocommit = conn is not getattr(self._local, "conn", None)
+            if autocommit:
+                conn.autocommit = True
+            cursor = conn.reusable_cursor(cursor_factory)
+            try:
+                yield cursor
+            except Exception as e:
+                self._fail_deferred(e)
+                raise
+            finally:
+                if autocommit:
+                    conn.autocommit = False
+
+    def get_steel_grades(self, ttl: float = STEEL_GRADES_TTL_SECONDS) -> List[Dict[str, Any]]:
+        """Fetch all steel grades, served from memory for ``ttl`` seconds."""
+        now = time.monotonic()
+        if self._steel_grades is None or now - self._steel_grades_loaded_at >= ttl:
+            with self.read_cursor() as cur:
+                cur.execute("SELECT id, stl_grd_cd, stl_grd_nm FROM base.steel_grade")
+                self._steel_grades = cur.fetchall()
+            self._steel_grades_loaded_at = now
+        return list(self._steel_grades)
+
+    def invalidate_steel_grades(self) -> None:
+        """Drop the cached steel grades so the next get_steel_grades() reloads."""
+        self._steel_grades = None
 
     def clear_operations(self):
-        """Remove all operations, warnings, events, and KPI stats (demo reset)."""
+        """Remove all operations, warnings, events, and KPI stats (demo reset).
+
+        No other table references these four, so the TRUNCATE lists them all
+        and skips CASCADE's search for dependent tables.
+
+        The KPI stats table's persistence is then synced with
+        `unlogged_demo_mode` while the table is empty: UNLOGGED skips WAL for
+        the seeder's bulk KPI ingest (rows do not survive a crash, acceptable
+        for demo data only), and turning the flag off makes it LOGGED again.
+        The ALTER only runs when the table does not already match.
+
+        The per-month heat sequences are not owned by any column, so they are
+        restarted here explicitly alongside the identity columns.
+        """
         with self.cursor() as cur:
             cur.execute("""
                 TRUNCATE steelmaking.steelmaking_event,
                          steelmaking.steelmaking_warning,
                          steelmaking.steelmaking_kpi_stats,
                          steelmaking.steelmaking_operation
-                RESTART IDENTITY CASCADE
+                RESTART IDENTITY
             """)
+            cur.execute("""
+                SELECT setval(c.oid, 1, false)
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'steelmaking'
+                  AND c.relkind = 'S'
+                  AND c.relname ~ '^heat_seq_[0-9]{4}$'
+            """)
+            cur.execute("""
+                SELECT relpersistence
+                FROM pg_class
+                WHERE oid = 'steelmaking.steelmaking_kpi_stats'::regclass
+            """)
+            unlogged = cur.fetchone()["relpersistence"] == "u"
+            if unlogged != self.config.unlogged_demo_mode:
+                persistence = "UNLOGGED" if self.config.unlogged_demo_mode else "LOGGED"
+                cur.execute(f"ALTER TABLE steelmaking.steelmaking_kpi_stats SET {persistence}")
 
     # --- Operation Methods (delegated to OperationQueries) ---
     
     def get_active_operations(self) -> List[Dict[str, Any]]:
         """Get all active operations (status = 1)."""
-        from .operations import OperationQueries
         return OperationQueries.get_active_operations(self)
 
+    def has_active_operations(self) -> bool:
+        """Return whether any operation is active (status = 1)."""
+        return OperationQueries.has_active_operations(self)
+
     def get_pending_operations(self) -> List[Dict[str, Any]]:
         """Get all pending operations (status = 2)."""
-        from .operations import OperationQueries
         return OperationQueries.get_pending_operations(self)
 
+    def get_active_and_pending_operations(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get active and pending operations in a single round-trip."""
+        return OperationQueries.get_active_and_pending_operations(self)
+
     def get_heat_operations(self, heat_no: int) -> List[Dict[str, Any]]:
         """Get all operations for a specific heat."""
-        from .operations import OperationQueries
         return OperationQueries.get_heat_operations(self, heat_no)
 
     def get_device_current_operation(self, device_no: str):
         """Get the current active or pending operation for a device."""
-        from .operations import OperationQueries
         return OperationQueries.get_device_current_operation(self, device_no)
 
-    def get_latest_heat_no(self) -> int:
-        """Get the latest heat number."""
-        from .operations import OperationQueries
-        return OperationQueries.get_latest_heat_no(self)
+    def get_latest_heat_no(self, month_base: Optional[int] = None) -> int:
+        """Get the latest heat number, optionally within one year-month block."""
+        return OperationQueries.get_latest_heat_no(self, month_base)
 
     def get_latest_heat_no_for_month(self, year: int, month: int) -> int:
         """Get the latest heat number for the given year-month window."""
-        from .operations import OperationQueries
         return OperationQueries.get_latest_heat_no_for_month(self, year, month)
 
+    def allocate_heat_no(self, year: int, month: int) -> int:
+        """Allocate the next heat number for a year-month from its sequence.
+
+        The sequence is created and synced with stored heats on first use in
+        this process; afterwards allocation is a single nextval() call. Inside
+        ``transaction()`` the CREATE SEQUENCE only counts as done once the
+        block commits, so a rolled-back block creates it again next time.
+        """
+        key = (year, month)
+        created = getattr(self._local, "created_heat_sequences", None)
+        if key not in self._heat_sequences and not (created and key in created):
+            OperationQueries.ensure_heat_sequence(self, year, month)
+            if getattr(self._local, "deferred_commit", False):
+                created.add(key)
+            else:
+                self._heat_sequences.add(key)
+        return OperationQueries.next_heat_no(self, year, month)
+
     def insert_operation(self, heat_no, pro_line_cd, proc_cd, device_no, crew_cd, 
                         stl_grd_id, stl_grd_cd, proc_status, plan_start_time, 
                         plan_end_time, real_start_time=None, real_end_time=None) -> int:
         """Insert a new operation record."""
-        from .operations import OperationQueries
         return OperationQueries.insert_operation(
             self, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
             stl_grd_id, stl_grd_cd, proc_status, plan_start_time,
             plan_end_time, real_start_time, real_end_time
         )
 
+    def insert_operations_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        """Insert multiple operation records in a batch, returning their IDs."""
+        return OperationQueries.insert_operations_batch(self, operations)
+
+    def cancel_operations(self, operation_ids: List[int]) -> None:
+        """Mark operations as canceled and clear their real timestamps."""
+        return OperationQueries.cancel_operations(self, operation_ids)
+
     def update_operation_status(self, operation_id, proc_status, real_start_time=None,
                                real_end_time=None, device_no=None):
         """Update operation status and timestamps."""
-        from .operations import OperationQueries
         return OperationQueries.update_operation_status(
             self, operation_id, proc_status, real_start_time, real_end_time, device_no
         )
 
+    def update_operations_status_batch(self, updates: List[Dict[str, Any]]) -> None:
+        """Apply several status updates in a single statement."""
+        return OperationQueries.update_operations_status_batch(self, updates)
+
     def update_operation_plan_times(self, operation_id, plan_start_time, plan_end_time):
         """Update planned timestamps for an operation."""
-        from .operations import OperationQueries
         return OperationQueries.update_operation_plan_times(
             self, operation_id, plan_start_time, plan_end_time
         )
 
     def get_available_device(self, proc_cd: str, devices: List[str]):
         """Find an available device (no active operation) for the given process."""
-        from .operations import OperationQueries
         return OperationQueries.get_available_device(self, proc_cd, devices)
 
-    def get_device_operation_windows(self, device_no, min_window_start, exclude_operation_id=None):
-        """Return scheduled/active windows on a device ordered by start time."""
-        from .operations import OperationQueries
-        return OperationQueries.get_device_operation_windows(
-            self, device_no, min_window_start, exclude_operation_id
+    def get_device_busy_windows(
+        self, device_no, desired_start, exclude_operation_id=None, *, include_pending_plans=True
+    ):
+        """Return (start, end) windows relevant to a slot search from desired_start."""
+        return OperationQueries.get_device_busy_windows(
+            self,
+            device_no,
+            desired_start,
+            exclude_operation_id,
+            include_pending_plans=include_pending_plans,
         )
 
     # --- Warning Methods (delegated to WarningQueries) ---
@@ -138,7 +415,6 @@ class DatabaseManager:
                       warning_level, warning_msg, warning_time_start, warning_time_end,
                       warning_code=None, extra=None) -> int:
         """Insert a warning event."""
-        from .warnings import WarningQueries
         return WarningQueries.insert_warning(
             self, heat_no=heat_no, pro_line_cd=pro_line_cd, proc_cd=proc_cd,
             device_no=device_no, warning_level=warning_level, warning_msg=warning_msg,
@@ -146,10 +422,21 @@ class DatabaseManager:
             warning_code=warning_code, extra=extra
         )
 
+    def insert_warnings_batch(self, warnings: List[Dict[str, Any]]) -> int:
+        """Insert multiple warnings in a batch."""
+        return WarningQueries.insert_warnings_batch(self, warnings)
+
+    def get_operation_warning_stats(self, *, heat_no, proc_cd, device_no,
+                                    window_start, window_end):
+        """Return (warning count, latest warning_time_end) for an operation window."""
+        return WarningQueries.get_operation_warning_stats(
+            self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
+            window_start=window_start, window_end=window_end
+        )
+
     def get_operation_warning_count(self, *, heat_no, proc_cd, device_no, 
                                    window_start, window_end) -> int:
         """Return number of warnings already emitted within an operation window."""
-        from .warnings import WarningQueries
         return WarningQueries.get_operation_warning_count(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -158,7 +445,6 @@ class DatabaseManager:
     def get_operation_last_warning_end_time(self, *, heat_no, proc_cd, device_no,
                                            window_start, window_end):
         """Return the latest warning_time_end for an operation window, or None."""
-        from .warnings import WarningQueries
         return WarningQueries.get_operation_last_warning_end_time(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -169,7 +455,6 @@ class DatabaseManager:
     def insert_event(self, *, heat_no, pro_line_cd, proc_cd, device_no,
                     event_code, event_name, event_msg, event_time_start, event_time_end, extra=None) -> int:
         """Insert a steelmaking event."""
-        from .events import EventQueries
         return EventQueries.insert_event(
             self, heat_no=heat_no, pro_line_cd=pro_line_cd, proc_cd=proc_cd,
             device_no=device_no, event_code=event_code, event_name=event_name, event_msg=event_msg,
@@ -178,13 +463,23 @@ class DatabaseManager:
 
     def insert_events_batch(self, events: List[Dict[str, Any]]) -> int:
         """Insert multiple events in a batch."""
-        from .events import EventQueries
         return EventQueries.insert_events_batch(self, events)
 
+    def get_operation_event_stats(self, *, heat_no, proc_cd, device_no,
+                                  window_start, window_end):
+        """Return (event count, latest event_time_start) for an operation window."""
+        return EventQueries.get_operation_event_stats(
+            self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
+            window_start=window_start, window_end=window_end
+        )
+
+    def get_operations_event_stats(self, windows) -> List[Tuple[int, Any]]:
+        """Return (event count, latest event_time_start) for several operation windows."""
+        return EventQueries.get_operations_event_stats(self, windows)
+
     def get_operation_event_count(self, *, heat_no, proc_cd, device_no,
                                  window_start, window_end) -> int:
         """Return number of events already emitted within an operation window."""
-        from .events import EventQueries
         return EventQueries.get_operation_event_count(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -193,7 +488,6 @@ class DatabaseManager:
     def get_operation_last_event_time(self, *, heat_no, proc_cd, device_no,
                                      window_start, window_end):
         """Return the latest event_time_start for an operation window, or None."""
-        from .events import EventQueries
         return EventQueries.get_operation_last_event_time(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -202,7 +496,6 @@ class DatabaseManager:
     def get_operation_events(self, *, heat_no, proc_cd, device_no,
                             window_start, window_end) -> List[Dict[str, Any]]:
         """Return all events for an operation within the given time window."""
-        from .events import EventQueries
         return EventQueries.get_operation_events(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -212,18 +505,15 @@ class DatabaseManager:
 
     def get_kpi_definitions_by_proc_cd(self, proc_cd: str) -> List[Dict[str, Any]]:
         """Fetch all KPI definitions for a given process code."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.get_kpi_definitions_by_proc_cd(self, proc_cd)
 
     def get_all_kpi_definitions(self) -> Dict[str, List[Dict[str, Any]]]:
         """Fetch all KPI definitions grouped by process code."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.get_all_kpi_definitions(self)
 
     def insert_kpi_stat(self, *, heat_no, pro_line_cd, proc_cd, device_no,
                        kpi_code, stat_value, sample_time, extra=None) -> int:
         """Insert a single KPI statistic record."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.insert_kpi_stat(
             self, heat_no=heat_no, pro_line_cd=pro_line_cd, proc_cd=proc_cd,
             device_no=device_no, kpi_code=kpi_code, stat_value=stat_value,
@@ -232,13 +522,11 @@ class DatabaseManager:
 
     def insert_kpi_stats_batch(self, stats: List[Dict[str, Any]]) -> int:
         """Insert multiple KPI statistics records in a batch."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.insert_kpi_stats_batch(self, stats)
 
     def get_operation_kpi_stats_count(self, *, heat_no, proc_cd, device_no,
                                      window_start, window_end) -> int:
         """Count KPI stats for an operation within a time window."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.get_operation_kpi_stats_count(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -247,7 +535,6 @@ class DatabaseManager:
     def get_operation_last_kpi_sample_time(self, *, heat_no, proc_cd, device_no,
                                           window_start, window_end):
         """Get the latest sample_time for KPI stats in an operation window."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.get_operation_last_kpi_sample_time(
             self, heat_no=heat_no, proc_cd=proc_cd, device_no=device_no,
             window_start=window_start, window_end=window_end
@@ -255,5 +542,4 @@ class DatabaseManager:
 
     def clear_kpi_stats(self) -> None:
         """Clear all KPI statistics (for demo reset)."""
-        from .kpi_stats import KpiStatsQueries
         return KpiStatsQueries.clear_kpi_stats(self)
@@ -1,7 +1,181 @@
 """Operation-related database queries."""
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+from psycopg2 import sql
+from psycopg2.extras import DictCursor
+
+from ..config import HEAT_SEQ_SPAN
+from ..utils import heat_month_base
+
+
+# Shared projection of the operation row returned by every operation fetch.
+_OPERATION_SELECT = """
+SELECT id, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
+       stl_grd_id, stl_grd_cd, proc_status,
+       plan_start_time, plan_end_time,
+       real_start_time, real_end_time
+FROM steelmaking.steelmaking_operation
+"""
+
+
+def _operations_query(where: str, order_by: str, limit: Optional[int] = None) -> str:
+    """Build an operation SELECT over the shared projection."""
+    query = f"{_OPERATION_SELECT}WHERE {where}\nORDER BY {order_by}\n"
+    return query if limit is None else f"{query}LIMIT {limit}\n"
+
+
+def _busy_windows_query(exclude_id: bool, include_pending_plans: bool) -> str:
+    """Build one device busy-window statement variant.
+
+    Each option gets its own variant so every filter stays a plain predicate;
+    a shared `($n IS NULL OR id <> $n)` or `($n OR ...)` would stay an opaque
+    OR in the session's generic plan. Both UNION ALL branches read the table
+    directly, so each is a range scan on idx_stlmk_op_device_window.
+    """
+    params = "(text, timestamptz, bigint)" if exclude_id else "(text, timestamptz)"
+    filters = "WHERE device_no = $1"
+    if exclude_id:
+        filters += "\n          AND id <> $3"
+    if not include_pending_plans:
+        filters += "\n          AND NOT (proc_status = 2 AND real_start_time IS NULL)"
+    return f"""
+        {params} AS
+        (SELECT effective_start_time AS window_start,
+                effective_end_time AS window_end
+         FROM steelmaking.steelmaking_operation
+         {filters}
+          AND effective_start_time <= $2
+         ORDER BY effective_start_time DESC
+         LIMIT 1)
+        UNION ALL
+        (SELECT effective_start_time, effective_end_time
+         FROM steelmaking.steelmaking_operation
+         {filters}
+          AND effective_start_time > $2)
+        ORDER BY window_start
+    """
+
+
+def _busy_windows_statement(exclude_id: bool, include_pending_plans: bool) -> str:
+    """Name of the prepared busy-window variant for the given options."""
+    name = "op_device_busy_windows"
+    if not include_pending_plans:
+        name += "_started"
+    return name + "_excl" if exclude_id else name
+
+
+# Snapshot reads return psycopg2 DictRow rows: a list of values plus one
+# column index shared by the cursor, instead of a fresh dict per row. They
+# still support op["col"] and op.get("col") like the RealDictCursor rows.
+_ROW_FACTORY = DictCursor
+
+
+# Server-side prepared statements (name -> parameter types and body), registered
+# once per connection by DatabaseManager and invoked with EXECUTE.
+PREPARED_STATEMENTS = {
+    "op_active": "AS" + _operations_query("proc_status = 1", "real_start_time"),
+    "op_pending": "AS" + _operations_query("proc_status = 2", "plan_start_time"),
+    "op_any_active": """
+        AS
+        SELECT EXISTS (
+            SELECT 1 FROM steelmaking.steelmaking_operation WHERE proc_status = 1
+        )
+    """,
+    "op_active_pending": "AS" + _operations_query(
+        "proc_status IN (1, 2)",
+        "proc_status, CASE WHEN proc_status = 1 THEN real_start_time ELSE plan_start_time END",
+    ),
+    "op_heat": "(bigint) AS" + _operations_query("heat_no = $1", "plan_start_time"),
+    "op_device_current": "(text) AS" + _operations_query(
+        "device_no = $1 AND proc_status IN (1, 2)", "proc_status, plan_start_time", limit=1
+    ),
+    "op_first_free_device": """
+        (text[]) AS
+        SELECT t.device_no
+        FROM unnest($1) WITH ORDINALITY AS t(device_no, ord)
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM steelmaking.steelmaking_operation o
+            WHERE o.device_no = t.device_no AND o.proc_status = 1
+        )
+        ORDER BY t.ord
+        LIMIT 1
+    """,
+    "op_device_busy_windows": _busy_windows_query(exclude_id=False, include_pending_plans=True),
+    "op_device_busy_windows_excl": _busy_windows_query(exclude_id=True, include_pending_plans=True),
+    "op_device_busy_windows_started": _busy_windows_query(
+        exclude_id=False, include_pending_plans=False
+    ),
+    "op_device_busy_windows_started_excl": _busy_windows_query(
+        exclude_id=True, include_pending_plans=False
+    ),
+    "op_latest_heat": """
+        AS
+        SELECT COALESCE(MAX(heat_no), 0) AS max_heat_no
+        FROM steelmaking.steelmaking_operation
+    """,
+    "op_latest_heat_in_range": """
+        (bigint, bigint) AS
+        SELECT COALESCE(MAX(heat_no), 0) AS max_heat_no
+        FROM steelmaking.steelmaking_operation
+        WHERE heat_no >= $1 AND heat_no < $2
+    """,
+    "op_insert": """
+        (bigint, text, text, text, text, bigint, text, smallint,
+         timestamptz, timestamptz, timestamptz, timestamptz) AS
+        INSERT INTO steelmaking.steelmaking_operation
+        (heat_no, pro_line_cd, proc_cd, device_no, crew_cd, stl_grd_id, stl_grd_cd,
+         proc_status, plan_start_time, plan_end_time, real_start_time, real_end_time)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+        RETURNING id
+    """,
+    "op_insert_batch": """
+        (bigint[], text[], text[], text[], text[], bigint[], text[], smallint[],
+         timestamptz[], timestamptz[], timestamptz[], timestamptz[]) AS
+        INSERT INTO steelmaking.steelmaking_operation
+        (heat_no, pro_line_cd, proc_cd, device_no, crew_cd, stl_grd_id, stl_grd_cd,
+         proc_status, plan_start_time, plan_end_time, real_start_time, real_end_time)
+        SELECT * FROM unnest($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+        RETURNING id
+    """,
+    "op_update_status": """
+        (smallint, timestamptz, timestamptz, text, bigint) AS
+        UPDATE steelmaking.steelmaking_operation
+        SET proc_status = $1,
+            real_start_time = COALESCE($2, real_start_time),
+            real_end_time = COALESCE($3, real_end_time),
+            device_no = COALESCE($4, device_no)
+        WHERE id = $5
+    """,
+    "op_update_status_batch": """
+        (bigint[], smallint[], timestamptz[], timestamptz[], text[]) AS
+        UPDATE steelmaking.steelmaking_operation AS t
+        SET proc_status = v.proc_status,
+            real_start_time = COALESCE(v.real_start_time, t.real_start_time),
+            real_end_time = COALESCE(v.real_end_time, t.real_end_time),
+            device_no = COALESCE(v.device_no, t.device_no)
+        FROM unnest($1, $2, $3, $4, $5)
+             AS v(id, proc_status, real_start_time, real_end_time, device_no)
+        WHERE t.id = v.id
+    """,
+    "op_update_plan": """
+        (timestamptz, timestamptz, bigint) AS
+        UPDATE steelmaking.steelmaking_operation
+        SET plan_start_time = $1,
+            plan_end_time = $2
+        WHERE id = $3
+    """,
+    "op_cancel": """
+        (bigint[]) AS
+        UPDATE steelmaking.steelmaking_operation
+        SET proc_status = 3,
+            real_start_time = NULL,
+            real_end_time = NULL
+        WHERE id = ANY($1)
+    """,
+}
 
 
 class OperationQueries:
@@ -10,74 +184,74 @@ class OperationQueries:
     @staticmethod
     def get_active_operations(db) -> List[Dict[str, Any]]:
         """Get all active operations (status = 1)."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT id, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
-                       stl_grd_id, stl_grd_cd, proc_status,
-                       plan_start_time, plan_end_time,
-                       real_start_time, real_end_time
-                FROM steelmaking.steelmaking_operation
-                WHERE proc_status = 1
-                ORDER BY real_start_time
-            """)
+        with db.read_cursor(cursor_factory=_ROW_FACTORY) as cur:
+            cur.execute("EXECUTE op_active")
             return cur.fetchall()
 
+    @staticmethod
+    def has_active_operations(db) -> bool:
+        """Return whether any operation is active (status = 1)."""
+        with db.read_cursor(cursor_factory=None) as cur:
+            cur.execute("EXECUTE op_any_active")
+            return cur.fetchone()[0]
+
     @staticmethod
     def get_pending_operations(db) -> List[Dict[str, Any]]:
         """Get all pending operations (status = 2)."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT id, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
-                       stl_grd_id, stl_grd_cd, proc_status,
-                       plan_start_time, plan_end_time,
-                       real_start_time, real_end_time
-                FROM steelmaking.steelmaking_operation
-                WHERE proc_status = 2
-                ORDER BY plan_start_time
-            """)
+        with db.read_cursor(cursor_factory=_ROW_FACTORY) as cur:
+            cur.execute("EXECUTE op_pending")
             return cur.fetchall()
 
+    @staticmethod
+    def get_active_and_pending_operations(
+        db,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get active (status = 1) and pending (status = 2) operations in one query.
+
+        Returns:
+            (active, pending), ordered like get_active_operations and
+            get_pending_operations respectively
+        """
+        with db.read_cursor(cursor_factory=_ROW_FACTORY) as cur:
+            cur.execute("EXECUTE op_active_pending")
+            rows = cur.fetchall()
+        active = [row for row in rows if row["proc_status"] == 1]
+        pending = [row for row in rows if row["proc_status"] == 2]
+        return active, pending
+
     @staticmethod
     def get_heat_operations(db, heat_no: int) -> List[Dict[str, Any]]:
         """Get all operations for a specific heat."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT id, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
-                       stl_grd_id, stl_grd_cd, proc_status,
-                       plan_start_time, plan_end_time,
-                       real_start_time, real_end_time
-                FROM steelmaking.steelmaking_operation
-                WHERE heat_no = %s
-                ORDER BY plan_start_time
-            """, (heat_no,))
+        with db.read_cursor(cursor_factory=_ROW_FACTORY) as cur:
+            cur.execute("EXECUTE op_heat (%s)", (heat_no,))
             return cur.fetchall()
 
     @staticmethod
     def get_device_current_operation(db, device_no: str) -> Optional[Dict[str, Any]]:
         """Get the current active or pending operation for a device."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT id, heat_no, pro_line_cd, proc_cd, device_no, crew_cd,
-                       stl_grd_id, stl_grd_cd, proc_status,
-                       plan_start_time, plan_end_time,
-                       real_start_time, real_end_time
-                FROM steelmaking.steelmaking_operation
-                WHERE device_no = %s AND proc_status IN (1, 2)
-                ORDER BY proc_status, plan_start_time
-                LIMIT 1
-            """, (device_no,))
+        with db.read_cursor() as cur:
+            cur.execute("EXECUTE op_device_current (%s)", (device_no,))
             return cur.fetchone()
 
     @staticmethod
-    def get_latest_heat_no(db) -> int:
-        """Get the latest heat number."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT COALESCE(MAX(heat_no), 0) as max_heat_no
-                FROM steelmaking.steelmaking_operation
-            """)
+    def get_latest_heat_no(db, month_base: Optional[int] = None) -> int:
+        """Get the latest heat number, optionally within one year-month block.
+
+        Args:
+            month_base: first heat number of a year-month block (YYMM00000);
+                when given, only heats in [month_base, month_base + HEAT_SEQ_SPAN)
+                are considered
+        """
+        with db.read_cursor(cursor_factory=None) as cur:
+            if month_base is None:
+                cur.execute("EXECUTE op_latest_heat")
+            else:
+                cur.execute(
+                    "EXECUTE op_latest_heat_in_range (%s, %s)",
+                    (month_base, month_base + HEAT_SEQ_SPAN),
+                )
             result = cur.fetchone()
-            return result['max_heat_no'] if result else 0
+            return result[0] if result else 0
 
     @staticmethod
     def get_latest_heat_no_for_month(db, year: int, month: int) -> int:
@@ -86,17 +260,59 @@ class OperationQueries:
         Heat number encoding packs `year` and two-digit `month` into the high digits,
         so we use an integer range filter instead of trying to parse existing values.
         """
-        lower_bound = int(f"{year:02d}{month:02d}00000")
-        upper_bound = int(f"{year:02d}{month:02d}99999")
+        if not 1 <= month <= 12:
+            raise ValueError(f"month must be in 1..12, got {month}")
+        month_base = heat_month_base(year, month)
+        return OperationQueries.get_latest_heat_no(db, month_base)
 
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT COALESCE(MAX(heat_no), 0) AS max_heat_no
-                FROM steelmaking.steelmaking_operation
-                WHERE heat_no >= %s AND heat_no < %s
-            """, (lower_bound, upper_bound))
-            result = cur.fetchone()
-            return result['max_heat_no'] if result else 0
+    @staticmethod
+    def heat_sequence_name(year: int, month: int) -> str:
+        """Name of the per-month heat sequence, e.g. heat_seq_2401."""
+        return f"heat_seq_{year % 100:02d}{month:02d}"
+
+    @staticmethod
+    def ensure_heat_sequence(db, year: int, month: int) -> None:
+        """Create the year-month heat sequence and sync it with stored heats.
+
+        The sequence is not OWNED BY the heat_no column, so creating it does
+        not require owning steelmaking_operation; the demo reset restarts it
+        explicitly (see DatabaseManager.clear_operations).
+        """
+        name = OperationQueries.heat_sequence_name(year, month)
+        month_base = heat_month_base(year, month)
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute(
+                sql.SQL("""
+                    CREATE SEQUENCE IF NOT EXISTS {}
+                    MINVALUE 1 MAXVALUE {}
+                """).format(
+                    sql.Identifier("steelmaking", name),
+                    sql.Literal(HEAT_SEQ_SPAN - 1),
+                )
+            )
+            cur.execute(
+                """
+                SELECT setval(%s::regclass, GREATEST(latest, 1), latest > 0)
+                FROM (
+                    SELECT COALESCE(MAX(heat_no) - %s, 0) AS latest
+                    FROM steelmaking.steelmaking_operation
+                    WHERE heat_no >= %s AND heat_no < %s
+                ) m
+                """,
+                (f"steelmaking.{name}", month_base, month_base, month_base + HEAT_SEQ_SPAN),
+            )
+
+    @staticmethod
+    def next_heat_no(db, year: int, month: int) -> int:
+        """Allocate the next heat number from the year-month sequence."""
+        name = OperationQueries.heat_sequence_name(year, month)
+        month_base = heat_month_base(year, month)
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute(
+                "SELECT %s + nextval(%s::regclass)",
+                (month_base, f"steelmaking.{name}"),
+            )
+            return cur.fetchone()[0]
 
     @staticmethod
     def insert_operation(
@@ -115,17 +331,72 @@ class OperationQueries:
         real_end_time: Optional[datetime] = None
     ) -> int:
         """Insert a new operation record."""
-        with db.cursor() as cur:
+        with db.cursor(cursor_factory=None) as cur:
             cur.execute("""
-                INSERT INTO steelmaking.steelmaking_operation
-                (heat_no, pro_line_cd, proc_cd, device_no, crew_cd, stl_grd_id, stl_grd_cd,
-                 proc_status, plan_start_time, plan_end_time, real_start_time, real_end_time)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
+                EXECUTE op_insert (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (heat_no, pro_line_cd, proc_cd, device_no, crew_cd, stl_grd_id, stl_grd_cd,
                   proc_status, plan_start_time, plan_end_time, real_start_time, real_end_time))
-            result = cur.fetchone()
-            return result['id']
+            return cur.fetchone()[0]
+
+    @staticmethod
+    def insert_operations_batch(
+        db,
+        operations: List[Dict[str, Any]],
+    ) -> List[int]:
+        """Insert multiple operation records in a single statement.
+
+        Args:
+            operations: List of operation dictionaries with keys matching
+                insert_operation params (real_start_time/real_end_time optional)
+
+        Returns:
+            Inserted operation IDs, in the same order as `operations`
+        """
+        if not operations:
+            return []
+
+        # One array per column; the statement text never changes with the
+        # row count, so it can stay prepared on the session.
+        columns = [[] for _ in range(12)]
+        for op in operations:
+            row = (
+                op["heat_no"],
+                op["pro_line_cd"],
+                op["proc_cd"],
+                op["device_no"],
+                op["crew_cd"],
+                op["stl_grd_id"],
+                op["stl_grd_cd"],
+                op["proc_status"],
+                op["plan_start_time"],
+                op["plan_end_time"],
+                op.get("real_start_time"),
+                op.get("real_end_time"),
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute(
+                """
+                EXECUTE op_insert_batch (
+                    %s::bigint[], %s::text[], %s::text[], %s::text[], %s::text[], %s::bigint[],
+                    %s::text[], %s::smallint[], %s::timestamptz[], %s::timestamptz[],
+                    %s::timestamptz[], %s::timestamptz[]
+                )
+                """,
+                columns,
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    @staticmethod
+    def cancel_operations(db, operation_ids: List[int]) -> None:
+        """Mark operations as canceled and clear their real timestamps."""
+        if not operation_ids:
+            return
+
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute("EXECUTE op_cancel (%s::bigint[])", (list(operation_ids),))
 
     @staticmethod
     def update_operation_status(
@@ -139,14 +410,43 @@ class OperationQueries:
         """Update operation status and timestamps."""
         with db.cursor() as cur:
             cur.execute("""
-                UPDATE steelmaking.steelmaking_operation
-                SET proc_status = %s,
-                    real_start_time = COALESCE(%s, real_start_time),
-                    real_end_time = COALESCE(%s, real_end_time),
-                    device_no = COALESCE(%s, device_no)
-                WHERE id = %s
+                EXECUTE op_update_status (%s, %s, %s, %s, %s)
             """, (proc_status, real_start_time, real_end_time, device_no, operation_id))
 
+    @staticmethod
+    def update_operations_status_batch(db, updates: List[Dict[str, Any]]) -> None:
+        """Apply several status updates in a single statement.
+
+        Args:
+            updates: List of dictionaries with keys matching
+                update_operation_status params (real_start_time, real_end_time
+                and device_no optional; None keeps the stored value)
+        """
+        if not updates:
+            return
+
+        columns = ([], [], [], [], [])
+        for update in updates:
+            row = (
+                update["operation_id"],
+                update["proc_status"],
+                update.get("real_start_time"),
+                update.get("real_end_time"),
+                update.get("device_no"),
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute(
+                """
+                EXECUTE op_update_status_batch (
+                    %s::bigint[], %s::smallint[], %s::timestamptz[], %s::timestamptz[], %s::text[]
+                )
+                """,
+                columns,
+            )
+
     @staticmethod
     def update_operation_plan_times(
         db,
@@ -155,56 +455,50 @@ class OperationQueries:
         plan_end_time: datetime
     ):
         """Update planned timestamps for an operation."""
-        with db.cursor() as cur:
-            cur.execute("""
-                UPDATE steelmaking.steelmaking_operation
-                SET plan_start_time = %s,
-                    plan_end_time = %s
-                WHERE id = %s
-            """, (plan_start_time, plan_end_time, operation_id))
+        with db.cursor(cursor_factory=None) as cur:
+            cur.execute(
+                "EXECUTE op_update_plan (%s, %s, %s)",
+                (plan_start_time, plan_end_time, operation_id),
+            )
 
     @staticmethod
     def get_available_device(db, proc_cd: str, devices: List[str]) -> Optional[str]:
-        """Find an available device (no active operation) for the given process."""
-        with db.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT device_no
-                FROM steelmaking.steelmaking_operation
-                WHERE proc_status = 1 AND device_no = ANY(%s)
-            """, (devices,))
-            busy_devices = {row['device_no'] for row in cur.fetchall()}
-            
-            for device in devices:
-                if device not in busy_devices:
-                    return device
-            return None
-
-    @staticmethod
-    def get_device_operation_windows(
+        """Find an available device (no active operation) for the given process.
+
+        Devices are tried in the given order; the first one without an active
+        operation wins.
+        """
+        with db.read_cursor(cursor_factory=None) as cur:
+            cur.execute("EXECUTE op_first_free_device (%s::text[])", (list(devices),))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    @staticmethod
+    def get_device_busy_windows(
         db,
         device_no: str,
-        min_window_start: datetime,
+        desired_start: datetime,
         exclude_operation_id: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
-        """Return scheduled/active windows on a device ordered by start time."""
-        with db.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id,
-                       proc_status,
-                       plan_start_time,
-                       plan_end_time,
-                       real_start_time,
-                       real_end_time
-                FROM steelmaking.steelmaking_operation
-                WHERE device_no = %s
-                  AND (%s IS NULL OR id <> %s)
-                  AND (
-                        proc_status = 1
-                        OR COALESCE(real_end_time, plan_end_time) >= %s
-                  )
-                ORDER BY COALESCE(real_start_time, plan_start_time)
-                """,
-                (device_no, exclude_operation_id, exclude_operation_id, min_window_start),
-            )
+        *,
+        include_pending_plans: bool = True,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Return the (start, end) windows that matter for a slot search.
+
+        Only windows starting after `desired_start`, plus the last one starting
+        at or before it (its end bounds the rest gap), can change the outcome,
+        so older history never leaves the server.
+
+        Args:
+            include_pending_plans: when False, pending operations that have not
+                really started are ignored
+        """
+        statement = _busy_windows_statement(exclude_operation_id is not None, include_pending_plans)
+        with db.read_cursor(cursor_factory=None) as cur:
+            if exclude_operation_id is None:
+                cur.execute(f"EXECUTE {statement} (%s, %s)", (device_no, desired_start))
+            else:
+                cur.execute(
+                    f"EXECUTE {statement} (%s, %s, %s)",
+                    (device_no, desired_start, exclude_operation_id),
+                )
             return cur.fetchall()
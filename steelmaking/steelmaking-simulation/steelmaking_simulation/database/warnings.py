@@ -1,9 +1,48 @@
 """Warning-related database queries."""
 
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from psycopg2.extras import Json
+from psycopg2.extras import execute_values
+
+from .copy import COPY_MIN_ROWS, INSERT_PAGE_SIZE, copy_rows
+from .jsonb import jsonb_param
+
+
+# Server-side prepared statements (name -> parameter types and body), registered
+# once per connection by DatabaseManager and invoked with EXECUTE.
+PREPARED_STATEMENTS = {
+    "warning_insert": """
+        (bigint, text, text, text, text, text, smallint, timestamptz, timestamptz, jsonb) AS
+        INSERT INTO steelmaking.steelmaking_warning (
+            heat_no, pro_line_cd, proc_cd, device_no,
+            warning_code, warning_msg, warning_level,
+            warning_time_start, warning_time_end, extra
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        RETURNING id
+    """,
+    "warning_window_stats": """
+        (bigint, text, text, timestamptz, timestamptz) AS
+        SELECT COUNT(*) AS n, MAX(warning_time_end) AS last_end
+        FROM steelmaking.steelmaking_warning
+        WHERE heat_no = $1
+          AND proc_cd = $2
+          AND device_no = $3
+          AND warning_time_start >= $4
+          AND warning_time_start <= $5
+    """,
+}
+
+WARNING_COLUMNS = (
+    "heat_no", "pro_line_cd", "proc_cd", "device_no",
+    "warning_code", "warning_msg", "warning_level",
+    "warning_time_start", "warning_time_end", "extra",
+)
+
+_INSERT_WARNINGS_SQL = (
+    f"INSERT INTO steelmaking.steelmaking_warning ({', '.join(WARNING_COLUMNS)}) VALUES %s"
+)
 
 
 class WarningQueries:
@@ -25,17 +64,9 @@ class WarningQueries:
         extra: Optional[Dict[str, Any]] = None,
     ) -> int:
         """Insert a warning event (operation_id column removed from schema)."""
-        with db.cursor() as cur:
+        with db.cursor(cursor_factory=None) as cur:
             cur.execute(
-                """
-                INSERT INTO steelmaking.steelmaking_warning (
-                    heat_no, pro_line_cd, proc_cd, device_no,
-                    warning_code, warning_msg, warning_level,
-                    warning_time_start, warning_time_end, extra
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-                """,
+                "EXECUTE warning_insert (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
                 (
                     heat_no,
                     pro_line_cd,
@@ -46,14 +77,65 @@ class WarningQueries:
                     warning_level,
                     warning_time_start,
                     warning_time_end,
-                    Json(extra) if extra is not None else None,
+                    jsonb_param(extra),
                 ),
             )
-            result = cur.fetchone()
-            return result["id"]
+            return cur.fetchone()[0]
 
     @staticmethod
-    def get_operation_warning_count(
+    def insert_warnings_batch(
+        db,
+        warnings: List[Dict[str, Any]],
+    ) -> int:
+        """Insert multiple warnings in a batch.
+
+        Large batches (e.g. a whole seeding pass) are streamed with COPY;
+        smaller ones use a multi-row INSERT.
+
+        Args:
+            warnings: List of warning dictionaries with keys:
+                heat_no, pro_line_cd, proc_cd, device_no, warning_code,
+                warning_msg, warning_level, warning_time_start, warning_time_end, extra
+
+        Returns:
+            Number of warnings inserted
+        """
+        if not warnings:
+            return 0
+
+        rows = [
+            (
+                w["heat_no"],
+                w["pro_line_cd"],
+                w["proc_cd"],
+                w["device_no"],
+                w.get("warning_code"),
+                w["warning_msg"],
+                w["warning_level"],
+                w["warning_time_start"],
+                w["warning_time_end"],
+                w.get("extra"),
+            )
+            for w in warnings
+        ]
+
+        with db.cursor() as cur:
+            if len(rows) >= COPY_MIN_ROWS:
+                copy_rows(cur, "steelmaking.steelmaking_warning", WARNING_COLUMNS, rows)
+            else:
+                execute_values(
+                    cur,
+                    _INSERT_WARNINGS_SQL,
+                    [
+                        row[:-1] + (jsonb_param(row[-1]),)
+                        for row in rows
+                    ],
+                    page_size=INSERT_PAGE_SIZE,
+                )
+            return len(rows)
+
+    @staticmethod
+    def get_operation_warning_stats(
         db,
         *,
         heat_no: int,
@@ -61,23 +143,38 @@ class WarningQueries:
         device_no: str,
         window_start: datetime,
         window_end: datetime,
-    ) -> int:
-        """Return number of warnings already emitted within an operation window."""
-        with db.cursor() as cur:
+    ) -> Tuple[int, Optional[datetime]]:
+        """Return (warning count, latest warning_time_end) for an operation window.
+
+        Both aggregates come from the same rows, so one query answers both.
+        """
+        with db.read_cursor(cursor_factory=None) as cur:
             cur.execute(
-                """
-                SELECT COUNT(*) AS n
-                FROM steelmaking.steelmaking_warning
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND warning_time_start >= %s
-                  AND warning_time_start <= %s
-                """,
+                "EXECUTE warning_window_stats (%s, %s, %s, %s, %s)",
                 (heat_no, proc_cd, device_no, window_start, window_end),
             )
             row = cur.fetchone()
-            return int(row["n"]) if row else 0
+            return (int(row[0]), row[1]) if row else (0, None)
+
+    @staticmethod
+    def get_operation_warning_count(
+        db,
+        *,
+        heat_no: int,
+        proc_cd: str,
+        device_no: str,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> int:
+        """Return number of warnings already emitted within an operation window."""
+        return WarningQueries.get_operation_warning_stats(
+            db,
+            heat_no=heat_no,
+            proc_cd=proc_cd,
+            device_no=device_no,
+            window_start=window_start,
+            window_end=window_end,
+        )[0]
 
     @staticmethod
     def get_operation_last_warning_end_time(
@@ -88,20 +185,13 @@ class WarningQueries:
         device_no: str,
         window_start: datetime,
         window_end: datetime,
-    ):
+    ) -> Optional[datetime]:
         """Return the latest warning_time_end for an operation window, or None."""
-        with db.cursor() as cur:
-            cur.execute(
-                """
-                SELECT MAX(warning_time_end) AS last_end
-                FROM steelmaking.steelmaking_warning
-                WHERE heat_no = %s
-                  AND proc_cd = %s
-                  AND device_no = %s
-                  AND warning_time_start >= %s
-                  AND warning_time_start <= %s
-                """,
-                (heat_no, proc_cd, device_no, window_start, window_end),
-            )
-            row = cur.fetchone()
-            return row["last_end"] if row else None
+        return WarningQueries.get_operation_warning_stats(
+            db,
+            heat_no=heat_no,
+            proc_cd=proc_cd,
+            device_no=device_no,
+            window_start=window_start,
+            window_end=window_end,
+        )[1]
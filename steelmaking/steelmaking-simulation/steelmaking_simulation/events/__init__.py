@@ -3,7 +3,7 @@
 from .engine import EventEngine, EventEngineConfig
 from .generator import EventGenerator, Event, EventSequenceResult, SpecialEventType
 from .codes import EVENT_CODES, PROC_CD_TO_NAME
-from .sequences import EventSequenceConfig, EVENT_SEQUENCE_CONFIGS
+from .sequences import EventSequenceConfig, EVENT_SEQUENCE_CONFIGS, SPECIAL_EVENTS_BY_PROC_CD
 from .messages import EventMessageGenerator
 
 __all__ = [
@@ -17,5 +17,6 @@ __all__ = [
     "PROC_CD_TO_NAME",
     "EventSequenceConfig",
     "EVENT_SEQUENCE_CONFIGS",
+    "SPECIAL_EVENTS_BY_PROC_CD",
     "EventMessageGenerator",
 ]
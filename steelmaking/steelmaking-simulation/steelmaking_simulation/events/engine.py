@@ -17,7 +17,7 @@ import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections import Counter
-from typing import Any, Callable, Dict, List, Optional, Protocol
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
 from ..config import PRO_LINE_CD, SimulationConfig, CANCEL_EVENT_PROBABILITY, REWORK_EVENT_PROBABILITY
 from .generator import Event, EventGenerator, EventSequenceResult, SpecialEventType
@@ -42,7 +42,7 @@ class _SpecialEventCallback(Protocol):
     ) -> None: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class EventEngineConfig:
     """Configuration for event generation."""
     # Min/max events per operation for historical seeding
@@ -753,38 +753,47 @@ class EventEngine:
         end = operation.get("real_end_time") or operation.get("plan_end_time")
         return start, end
     
-    def should_emit_event_now(self, operation: Dict[str, Any], now: datetime) -> bool:
-        """Check if we should emit an event for this operation at this tick."""
+    @classmethod
+    def _realtime_stats_window(
+        cls, operation: Dict[str, Any], now: datetime
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Return the window used to count an active operation's events, if any."""
+        window_start, window_end = cls._operation_window(operation)
+        if not window_start:
+            return None
+        # For active operations, window_end might be None
+        return window_start, window_end or (now + timedelta(hours=1))
+    
+    def should_emit_event_now(
+        self,
+        operation: Dict[str, Any],
+        now: datetime,
+        stats: Optional[Tuple[int, Optional[datetime]]] = None,
+    ) -> bool:
+        """Check if we should emit an event for this operation at this tick.
+        
+        ``stats`` is the operation's (event count, last event time) when the
+        caller has already read it; otherwise it is queried here.
+        """
         max_events = self.event_config.max_realtime_events_per_operation
         if max_events <= 0:
             return False
         
-        window_start, window_end = self._operation_window(operation)
-        if not window_start:
-            return False
-        
-        # For active operations, window_end might be None
-        effective_end = window_end or (now + timedelta(hours=1))
-        
-        existing_events = self.db.get_operation_events(
-            heat_no=operation["heat_no"],
-            proc_cd=operation["proc_cd"],
-            device_no=operation["device_no"],
-            window_start=window_start,
-            window_end=effective_end,
-        )
-        count = len(existing_events)
+        if stats is None:
+            window = self._realtime_stats_window(operation, now)
+            if window is None:
+                return False
+            stats = self.db.get_operation_event_stats(
+                heat_no=operation["heat_no"],
+                proc_cd=operation["proc_cd"],
+                device_no=operation["device_no"],
+                window_start=window[0],
+                window_end=window[1],
+            )
+        count, last_time = stats
         if count >= max_events:
             return False
         
-        last_time = self.db.get_operation_last_event_time(
-            heat_no=operation["heat_no"],
-            proc_cd=operation["proc_cd"],
-            device_no=operation["device_no"],
-            window_start=window_start,
-            window_end=effective_end,
-        )
-        
         # Ensure minimum spacing between events
         if last_time is not None:
             min_spacing = 30.0  # 30 seconds minimum between events
@@ -799,6 +808,25 @@ class EventEngine:
         Returns:
             Event ID if inserted, None otherwise
         """
+        event = self.build_realtime_event(operation, now)
+        if not event:
+            return None
+        
+        event_id = self.db.insert_event(**event)
+        
+        self.logger.debug(
+            "Emitted realtime event %s (%s) for heat %s proc %s",
+            event["event_code"], event["event_name"], operation["heat_no"], operation["proc_cd"]
+        )
+        
+        return event_id
+    
+    def build_realtime_event(self, operation: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+        """Build the next real-time event dict for an active operation.
+        
+        Returns:
+            Event dict ready for insertion, or None if no event applies
+        """
         proc_name = self.get_process_name(operation["proc_cd"])
         if not proc_name:
             return None
@@ -852,33 +880,58 @@ class EventEngine:
         code, name, p1, p2, p3, p4 = event_info
         msg = EventMessageGenerator.generate_message(code, name, p1, p2, p3, p4)
         
-        event_id = self.db.insert_event(
-            heat_no=operation["heat_no"],
-            pro_line_cd=operation.get("pro_line_cd", PRO_LINE_CD),
-            proc_cd=operation["proc_cd"],
-            device_no=operation["device_no"],
-            event_code=event_code,
-            event_name=name,
-            event_msg=msg,
-            event_time_start=now,
-            event_time_end=now,
-            extra={"operation_id": operation.get("id")},
-        )
+        return {
+            "heat_no": operation["heat_no"],
+            "pro_line_cd": operation.get("pro_line_cd", PRO_LINE_CD),
+            "proc_cd": operation["proc_cd"],
+            "device_no": operation["device_no"],
+            "event_code": event_code,
+            "event_name": name,
+            "event_msg": msg,
+            "event_time_start": now,
+            "event_time_end": now,
+            "extra": {"operation_id": operation.get("id")},
+        }
+    
+    def tick_realtime_events(
+        self,
+        now: datetime,
+        active_ops: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Process real-time event generation for all active operations.
         
-        self.logger.debug(
-            "Emitted realtime event %s (%s) for heat %s proc %s",
-            event_code, name, operation["heat_no"], operation["proc_cd"]
-        )
+        Events for the tick are buffered and flushed in one batch insert;
+        each operation's events are independent, so deferring the write
+        does not change which events are chosen. ``active_ops`` lets the
+        caller share one active-operations snapshot across the tick.
+        """
+        if active_ops is None:
+            active_ops = self.db.get_active_operations()
         
-        return event_id
-    
-    def tick_realtime_events(self, now: datetime) -> None:
-        """Process real-time event generation for all active operations."""
-        active_ops = self.db.get_active_operations()
+        if self.event_config.max_realtime_events_per_operation <= 0:
+            return
         
+        # Read every operation's event stats in one query instead of one
+        # round trip per operation.
+        candidates = []
+        windows = []
         for op in active_ops:
-            if self.should_emit_event_now(op, now):
-                self.emit_realtime_event(op, now)
+            window = self._realtime_stats_window(op, now)
+            if window is not None:
+                candidates.append(op)
+                windows.append((op["heat_no"], op["proc_cd"], op["device_no"], *window))
+        stats = self.db.get_operations_event_stats(windows) if windows else []
+        
+        events_to_insert: List[Dict[str, Any]] = []
+        for op, op_stats in zip(candidates, stats):
+            if self.should_emit_event_now(op, now, op_stats):
+                event = self.build_realtime_event(op, now)
+                if event:
+                    events_to_insert.append(event)
+        
+        if events_to_insert:
+            count = self.db.insert_events_batch(events_to_insert)
+            self.logger.debug("Emitted %d realtime events", count)
     
     def emit_end_sequence_events(
         self,
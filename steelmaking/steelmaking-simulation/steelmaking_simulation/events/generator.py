@@ -28,7 +28,7 @@ from enum import Enum, auto
 from typing import Any, Dict, List, Optional, Tuple
 
 from .codes import EVENT_CODES, PROC_CD_TO_NAME
-from .sequences import EVENT_SEQUENCE_CONFIGS
+from .sequences import EVENT_SEQUENCE_CONFIGS, SPECIAL_EVENTS_BY_PROC_CD
 from .messages import EventMessageGenerator
 
 
@@ -39,7 +39,7 @@ class SpecialEventType(Enum):
     REWORK = auto()    # 回炉 - operation continues but flags for rework
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Represents a single steelmaking event."""
     heat_no: int
@@ -55,7 +55,7 @@ class Event:
     special_event_type: SpecialEventType = SpecialEventType.NONE
 
 
-@dataclass
+@dataclass(slots=True)
 class EventSequenceResult:
     """Result of generating an event sequence, including special event info."""
     events: List[Event]
@@ -149,11 +149,12 @@ class EventGenerator:
             return []
         
         # Determine if we should trigger special events
+        cancel_event, rework_event = SPECIAL_EVENTS_BY_PROC_CD[proc_cd]
         should_cancel = force_cancel or (
-            config.cancel_event and random.random() < self.cancel_probability
+            cancel_event is not None and random.random() < self.cancel_probability
         )
         should_rework = not should_cancel and (
-            force_rework or (config.rework_event and random.random() < self.rework_probability)
+            force_rework or (rework_event is not None and random.random() < self.rework_probability)
         )
         
         # Generate event codes sequence with special event consideration
@@ -3,8 +3,10 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from .codes import PROC_CD_TO_NAME
 
-@dataclass
+
+@dataclass(slots=True)
 class EventSequenceConfig:
     """Configuration for event sequence generation.
     
@@ -160,3 +162,12 @@ EVENT_SEQUENCE_CONFIGS: Dict[str, EventSequenceConfig] = {
         cancel_end_sequence=["G16012"],  # 炉次吊走 (skip normal ending)
     ),
 }
+
+
+# Process code -> (cancel_event, rework_event), resolved once at import so the
+# per-operation special event roll skips the name lookup and config access.
+SPECIAL_EVENTS_BY_PROC_CD: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    proc_cd: (EVENT_SEQUENCE_CONFIGS[name].cancel_event, EVENT_SEQUENCE_CONFIGS[name].rework_event)
+    for proc_cd, name in PROC_CD_TO_NAME.items()
+    if name in EVENT_SEQUENCE_CONFIGS
+}
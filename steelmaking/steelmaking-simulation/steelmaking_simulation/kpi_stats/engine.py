@@ -8,13 +8,13 @@ for active operations and integrates with the simulator's tick loop.
 from __future__ import annotations
 
 import random
-import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any, Callable, Dict, List, Optional, Protocol
 
 from ..config import SimulationConfig, PRO_LINE_CD
+from ..config._env import env_float, env_int
 from .generator import KpiValueGenerator, KpiStat
 
 
@@ -22,50 +22,34 @@ class _ProcessNameResolver(Protocol):
     def __call__(self, proc_cd: str) -> Optional[str]: ...
 
 
-@dataclass
+@dataclass(slots=True)
 class KpiStatsEngineConfig:
     """Configuration for KPI statistics generation."""
     
     # Probability of generating KPI stats for a completed operation during seeding
-    seed_kpi_stats_probability: float = float(
-        os.getenv("SEED_KPI_STATS_PROBABILITY", "0.95")
-    )
+    seed_kpi_stats_probability: float = env_float("SEED_KPI_STATS_PROBABILITY", 0.95)
     
     # Min/max number of sample points per operation for historical seeding
-    min_samples_per_operation: int = int(
-        os.getenv("MIN_KPI_SAMPLES_PER_OPERATION", "5")
-    )
-    max_samples_per_operation: int = int(
-        os.getenv("MAX_KPI_SAMPLES_PER_OPERATION", "15")
-    )
+    min_samples_per_operation: int = env_int("MIN_KPI_SAMPLES_PER_OPERATION", 5)
+    max_samples_per_operation: int = env_int("MAX_KPI_SAMPLES_PER_OPERATION", 15)
     
     # Probability of emitting KPI stats during a tick for active operations
-    kpi_probability_per_tick: float = float(
-        os.getenv("KPI_PROBABILITY_PER_TICK", "0.4")
-    )
+    kpi_probability_per_tick: float = env_float("KPI_PROBABILITY_PER_TICK", 0.4)
     
     # Minimum interval between KPI samples for the same operation (seconds)
-    min_sample_interval_seconds: int = int(
-        os.getenv("MIN_KPI_SAMPLE_INTERVAL_SECONDS", "30")
-    )
+    min_sample_interval_seconds: int = env_int("MIN_KPI_SAMPLE_INTERVAL_SECONDS", 30)
     
     # Maximum number of KPI sample batches per active operation during realtime
-    max_realtime_samples_per_operation: int = int(
-        os.getenv("MAX_REALTIME_KPI_SAMPLES_PER_OPERATION", "50")
-    )
+    max_realtime_samples_per_operation: int = env_int("MAX_REALTIME_KPI_SAMPLES_PER_OPERATION", 50)
     
     # Probability of values exceeding limits
-    out_of_range_probability: float = float(
-        os.getenv("KPI_OUT_OF_RANGE_PROBABILITY", "0.05")
-    )
+    out_of_range_probability: float = env_float("KPI_OUT_OF_RANGE_PROBABILITY", 0.05)
     
     # Factor for how much values can exceed limits (0.15 = 15% beyond)
-    out_of_range_factor: float = float(
-        os.getenv("KPI_OUT_OF_RANGE_FACTOR", "0.15")
-    )
+    out_of_range_factor: float = env_float("KPI_OUT_OF_RANGE_FACTOR", 0.15)
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationKpiState:
     """Tracks KPI generation state for an active operation."""
     operation_id: int
@@ -315,7 +299,11 @@ class KpiStatsEngine:
         )
         return count
     
-    def tick_realtime_kpi_stats(self, now: datetime) -> None:
+    def tick_realtime_kpi_stats(
+        self,
+        now: datetime,
+        active_ops: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
         """Generate real-time KPI stats for active operations during tick.
         
         This method is called during each simulation tick to potentially
@@ -323,8 +311,11 @@ class KpiStatsEngine:
         
         Args:
             now: Current simulation time
+            active_ops: Active operations already fetched for this tick;
+                loaded from the database when omitted
         """
-        active_ops = self.db.get_active_operations()
+        if active_ops is None:
+            active_ops = self.db.get_active_operations()
         
         for op in active_ops:
             if random.random() >= self.kpi_config.kpi_probability_per_tick:
@@ -8,11 +8,11 @@ from datetime import datetime, timedelta
 import inspect
 from typing import Any, Dict, List, Optional
 
-from ..config import EQUIPMENT, PROCESS_FLOW, PRO_LINE_CD, ProcessStatus, SimulationConfig
+from ..config import DEVICES_BY_STEP, PROC_CD_BY_STEP, PROCESS_FLOW, PRO_LINE_CD, ProcessStatus, SimulationConfig
 from ..utils import CST
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HeatPlanContext:
     db: Any
     config: SimulationConfig
@@ -55,7 +55,7 @@ class HeatPlanner:
             desired_start=now,
             latest_start=now,
             duration=bof_duration,
-            devices=EQUIPMENT["BOF"]["devices"],
+            devices=DEVICES_BY_STEP["BOF"],
             enforce_max_rest=False,
         )
         if not bof_slot:
@@ -67,7 +67,7 @@ class HeatPlanner:
                     desired_start=now,
                     latest_start=latest_start,
                     duration=bof_duration,
-                    devices=EQUIPMENT["BOF"]["devices"],
+                    devices=DEVICES_BY_STEP["BOF"],
                     enforce_max_rest=False,
                 )
 
@@ -81,7 +81,7 @@ class HeatPlanner:
         planned.append(
             {
                 "process_name": "BOF",
-                "proc_cd": EQUIPMENT["BOF"]["proc_cd"],
+                "proc_cd": PROC_CD_BY_STEP["BOF"],
                 "device_no": bof_device,
                 "plan_start": bof_slot.plan_start,
                 "plan_end": bof_slot.plan_end,
@@ -93,8 +93,7 @@ class HeatPlanner:
 
         prev_end = bof_slot.plan_end
         for process_name in PROCESS_FLOW[1:]:
-            proc_info = EQUIPMENT[process_name]
-            proc_cd = proc_info["proc_cd"]
+            proc_cd = PROC_CD_BY_STEP[process_name]
             duration = self.ctx.get_random_duration()
 
             transfer_offset = self.ctx.get_random_transfer_gap()
@@ -122,7 +121,7 @@ class HeatPlanner:
                     desired_start=desired_start,
                     latest_start=latest_start,
                     duration=duration,
-                    devices=proc_info["devices"],
+                    devices=DEVICES_BY_STEP[process_name],
                     enforce_max_rest=False,
                 )
 
@@ -150,21 +149,26 @@ class HeatPlanner:
         heat_no = self.ctx.generate_heat_no()
         self.ctx.logger.info("Creating new heat %s with steel grade %s", heat_no, steel_grade["stl_grd_cd"])
 
+        self.ctx.db.insert_operations_batch(
+            [
+                {
+                    "heat_no": heat_no,
+                    "pro_line_cd": PRO_LINE_CD,
+                    "proc_cd": entry["proc_cd"],
+                    "device_no": entry["device_no"],
+                    "crew_cd": crew_cd,
+                    "stl_grd_id": steel_grade["id"],
+                    "stl_grd_cd": steel_grade["stl_grd_cd"],
+                    "proc_status": entry["status"],
+                    "plan_start_time": entry["plan_start"],
+                    "plan_end_time": entry["plan_end"],
+                    "real_start_time": entry["real_start"],
+                    "real_end_time": entry["real_end"],
+                }
+                for entry in planned
+            ]
+        )
         for entry in planned:
-            self.ctx.db.insert_operation(
-                heat_no=heat_no,
-                pro_line_cd=PRO_LINE_CD,
-                proc_cd=entry["proc_cd"],
-                device_no=entry["device_no"],
-                crew_cd=crew_cd,
-                stl_grd_id=steel_grade["id"],
-                stl_grd_cd=steel_grade["stl_grd_cd"],
-                proc_status=entry["status"],
-                plan_start_time=entry["plan_start"],
-                plan_end_time=entry["plan_end"],
-                real_start_time=entry["real_start"],
-                real_end_time=entry["real_end"],
-            )
             self.ctx.logger.info(
                 "  Created %s operation on %s, status: %s",
                 entry["process_name"],
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
-from ..config import EQUIPMENT, PROCESS_FLOW, PRO_LINE_CD, ProcessStatus, SimulationConfig
+from ..config import DEVICES_BY_STEP, PROC_CD_BY_STEP, PROCESS_FLOW, PRO_LINE_CD, ProcessStatus, SimulationConfig
 from ..warnings import WarningEngine
 from ..events import EventEngine
 
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
     from ..kpi_stats import KpiStatsEngine
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SeedContext:
     db: any
     config: SimulationConfig
@@ -37,8 +37,9 @@ class OperationSeeder:
 
     def reset_demo_data(self, now: datetime) -> None:
         self.ctx.logger.info("Resetting demo data: clearing table and seeding past/future operations")
-        self.ctx.db.clear_operations()
-        self.seed_initial_timeline(now)
+        with self.ctx.db.bulk_session():
+            self.ctx.db.clear_operations()
+            self.seed_initial_timeline(now)
 
     def seed_initial_timeline(self, now: datetime) -> None:
         min_rest = self.ctx.config.min_rest_duration_minutes
@@ -51,9 +52,13 @@ class OperationSeeder:
         start_time = now - span_past
         end_time = now + span_future
 
-        bof_devices = EQUIPMENT["BOF"]["devices"]
-        lf_devices = EQUIPMENT["LF"]["devices"]
-        ccm_devices = EQUIPMENT["CCM"]["devices"]
+        # Historical warnings never feed back into seeding decisions, so they are
+        # collected for the whole pass and written in one bulk load at the end.
+        historical_warnings: List[Dict[str, Any]] = []
+
+        bof_devices = DEVICES_BY_STEP["BOF"]
+        lf_devices = DEVICES_BY_STEP["LF"]
+        ccm_devices = DEVICES_BY_STEP["CCM"]
 
         for line_idx, bof_device in enumerate(bof_devices):
             lf_device = lf_devices[line_idx] if line_idx < len(lf_devices) else lf_devices[0]
@@ -105,22 +110,17 @@ class OperationSeeder:
                     ccm_end = ccm_start + ccm_duration
 
                     stages = [
-                        ("BOF", EQUIPMENT["BOF"]["proc_cd"], bof_device, bof_start, bof_end),
-                        ("LF", EQUIPMENT["LF"]["proc_cd"], lf_device, lf_start, lf_end),
-                        ("CCM", EQUIPMENT["CCM"]["proc_cd"], ccm_device, ccm_start, ccm_end),
+                        ("BOF", PROC_CD_BY_STEP["BOF"], bof_device, bof_start, bof_end),
+                        ("LF", PROC_CD_BY_STEP["LF"], lf_device, lf_start, lf_end),
+                        ("CCM", PROC_CD_BY_STEP["CCM"], ccm_device, ccm_start, ccm_end),
                     ]
 
-                    # Track all operations for this heat for potential cancel handling
-                    heat_operations: List[Dict[str, Any]] = []
-                    canceled_from_stage: Optional[int] = None
-                    
-                    for stage_idx, (_name, proc_cd, device_no, plan_start, plan_end) in enumerate(stages):
-                        # If previous stage was canceled, this one is also canceled
-                        if canceled_from_stage is not None and stage_idx >= canceled_from_stage:
-                            proc_status = ProcessStatus.CANCELED
-                            real_start = None
-                            real_end = None
-                        elif plan_end <= now:
+                    # Derive each stage's status from its planned window, then insert the
+                    # whole heat in one round-trip; a cancel during event seeding below
+                    # flips the affected stages to CANCELED afterwards.
+                    operation_rows: List[Dict[str, Any]] = []
+                    for _name, proc_cd, device_no, plan_start, plan_end in stages:
+                        if plan_end <= now:
                             proc_status = ProcessStatus.COMPLETED
                             real_start = plan_start
                             real_end = plan_end
@@ -133,35 +133,35 @@ class OperationSeeder:
                             real_start = None
                             real_end = None
 
-                        operation_id = self.ctx.db.insert_operation(
-                            heat_no=heat_no,
-                            pro_line_cd=PRO_LINE_CD,
-                            proc_cd=proc_cd,
-                            device_no=device_no,
-                            crew_cd=crew_cd,
-                            stl_grd_id=steel_grade["id"],
-                            stl_grd_cd=steel_grade["stl_grd_cd"],
-                            proc_status=proc_status,
-                            plan_start_time=plan_start,
-                            plan_end_time=plan_end,
-                            real_start_time=real_start,
-                            real_end_time=real_end,
-                        )
-
-                        heat_operations.append({
-                            "id": operation_id,
-                            "stage_idx": stage_idx,
+                        operation_rows.append({
+                            "heat_no": heat_no,
+                            "pro_line_cd": PRO_LINE_CD,
                             "proc_cd": proc_cd,
                             "device_no": device_no,
+                            "crew_cd": crew_cd,
+                            "stl_grd_id": steel_grade["id"],
+                            "stl_grd_cd": steel_grade["stl_grd_cd"],
                             "proc_status": proc_status,
-                            "plan_start": plan_start,
-                            "plan_end": plan_end,
+                            "plan_start_time": plan_start,
+                            "plan_end_time": plan_end,
+                            "real_start_time": real_start,
+                            "real_end_time": real_end,
                         })
 
+                    operation_ids = self.ctx.db.insert_operations_batch(operation_rows)
+
+                    for stage_idx, (row, operation_id) in enumerate(zip(operation_rows, operation_ids)):
+                        proc_cd = row["proc_cd"]
+                        device_no = row["device_no"]
+                        proc_status = row["proc_status"]
+                        plan_start = row["plan_start_time"]
+                        plan_end = row["plan_end_time"]
+                        real_start = row["real_start_time"]
+
                         # For completed operations, seed warnings and events
                         if proc_status == ProcessStatus.COMPLETED:
                             # Seed historical warnings
-                            self.ctx.warnings.seed_historical_warnings_for_completed_operation(
+                            historical_warnings += self.ctx.warnings.build_historical_warnings_for_completed_operation(
                                 operation_id=operation_id,
                                 heat_no=heat_no,
                                 proc_cd=proc_cd,
@@ -183,13 +183,13 @@ class OperationSeeder:
                             
                             # If cancel event occurred, mark this and subsequent stages as canceled
                             if event_result.has_cancel:
-                                canceled_from_stage = stage_idx
                                 # Update this operation to CANCELED status
                                 self.ctx.db.update_operation_status(
                                     operation_id=operation_id,
                                     proc_status=ProcessStatus.CANCELED,
                                     real_end_time=event_result.cancel_event_time,
                                 )
+                                self.ctx.db.cancel_operations(operation_ids[stage_idx + 1:])
                                 self.ctx.logger.info(
                                     "Cancel event for heat %s at stage %s (%s), "
                                     "marking subsequent operations as canceled",
@@ -207,6 +207,10 @@ class OperationSeeder:
                                     window_start=plan_start,
                                     window_end=plan_end,
                                 )
+
+                            # Subsequent stages were canceled; nothing more to seed
+                            if event_result.has_cancel:
+                                break
                         
                         # For active operations, seed partial events (start + some middle events)
                         elif proc_status == ProcessStatus.ACTIVE:
@@ -241,3 +245,6 @@ class OperationSeeder:
 
                 if not inserted:
                     cursor += timedelta(minutes=max_rest)
+
+        if historical_warnings:
+            self.ctx.db.insert_warnings_batch(historical_warnings)
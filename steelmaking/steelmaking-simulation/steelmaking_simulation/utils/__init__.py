@@ -1,5 +1,6 @@
 """Utils package for steelmaking simulation."""
 
 from .time_utils import CST
+from .heat_no import heat_month_base
 
-__all__ = ["CST"]
+__all__ = ["CST", "heat_month_base"]
@@ -0,0 +1,14 @@
+"""Heat number encoding helpers."""
+
+from ..config import HEAT_SEQ_SPAN
+
+# Heat numbers are YYMMSSSSS; the year/month prefix is YY * 100 + MM.
+MONTH_MULTIPLIER = 100
+
+
+def heat_month_base(year: int, month: int) -> int:
+    """Return the first heat number (YYMM00000) of a year-month block.
+
+    Four-digit years are reduced to their last two digits.
+    """
+    return ((year % 100) * MONTH_MULTIPLIER + month) * HEAT_SEQ_SPAN
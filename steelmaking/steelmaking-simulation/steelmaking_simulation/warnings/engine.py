@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import random
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import Any, Dict, List, Optional, Protocol
 
 from ..config import SimulationConfig, PRO_LINE_CD
 from .templates import WARNING_TEMPLATES, WarningPayload
 
 
+# Warning level distribution, with cumulative weights computed once so each roll
+# skips re-accumulating the weight list.
+_WARNING_LEVELS = (1, 2, 3, 4)
+_WARNING_LEVEL_CUM_WEIGHTS = tuple(accumulate((0.1, 0.2, 0.35, 0.35)))
+
+
 class _ProcessNameResolver(Protocol):
     def __call__(self, proc_cd: str) -> Optional[str]: ...
 
@@ -24,7 +31,7 @@ class WarningEngine:
         self.logger = logger
 
     def random_warning_level(self) -> int:
-        return random.choices([1, 2, 3, 4], weights=[0.1, 0.2, 0.35, 0.35], k=1)[0]
+        return random.choices(_WARNING_LEVELS, cum_weights=_WARNING_LEVEL_CUM_WEIGHTS, k=1)[0]
 
     def get_warning_templates(self, proc_cd: str) -> List[Dict[str, Any]]:
         proc_name = self.get_process_name(proc_cd)
@@ -69,30 +76,58 @@ class WarningEngine:
         window_start: datetime,
         window_end: datetime,
     ) -> None:
+        warnings_to_insert = self.build_historical_warnings_for_completed_operation(
+            operation_id=operation_id,
+            heat_no=heat_no,
+            proc_cd=proc_cd,
+            device_no=device_no,
+            crew_cd=crew_cd,
+            window_start=window_start,
+            window_end=window_end,
+        )
+        if warnings_to_insert:
+            self.db.insert_warnings_batch(warnings_to_insert)
+
+    def build_historical_warnings_for_completed_operation(
+        self,
+        *,
+        operation_id: Optional[int],
+        heat_no: int,
+        proc_cd: str,
+        device_no: str,
+        crew_cd: str,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> List[Dict[str, Any]]:
+        """Build (without inserting) historical warnings for a completed operation."""
         if (
             self.config.max_warnings_per_operation <= 0
             or window_start is None
             or window_end is None
             or window_end <= window_start
         ):
-            return
+            return []
 
         if random.random() >= self.config.seed_warning_probability_per_completed_operation:
-            return
+            return []
 
-        if self.config.max_warnings_per_operation <= 2:
-            count = random.randint(1, self.config.max_warnings_per_operation)
+        max_count = self.config.max_warnings_per_operation
+        if max_count <= 2:
+            count = random.randint(1, max_count)
         else:
-            count = random.choices(
-                population=list(range(1, self.config.max_warnings_per_operation + 1)),
-                weights=[0.55, 0.25]
-                + [0.20 / (self.config.max_warnings_per_operation - 2)] * (self.config.max_warnings_per_operation - 2),
-                k=1,
-            )[0]
+            # P(1) = 0.55, P(2) = 0.25, remaining 0.20 spread evenly over 3..max_count;
+            # one uniform roll instead of building population/weight lists per operation.
+            roll = random.random()
+            if roll < 0.55:
+                count = 1
+            elif roll < 0.80:
+                count = 2
+            else:
+                count = random.randint(3, max_count)
 
         total_seconds = (window_end - window_start).total_seconds()
         if total_seconds <= 1:
-            return
+            return []
 
         segment = total_seconds / (count + 1)
         starts: List[datetime] = []
@@ -104,6 +139,7 @@ class WarningEngine:
             starts.append(start)
         starts.sort()
 
+        warnings_to_insert: List[Dict[str, Any]] = []
         for start in starts:
             duration_seconds = self.random_warning_duration_seconds()
             end = min(start + timedelta(seconds=duration_seconds), window_end)
@@ -111,18 +147,20 @@ class WarningEngine:
                 continue
 
             payload = self.build_warning_payload(proc_cd)
-            self.db.insert_warning(
-                heat_no=heat_no,
-                pro_line_cd=PRO_LINE_CD,
-                proc_cd=proc_cd,
-                device_no=device_no,
-                warning_code=payload.warning_code,
-                warning_msg=payload.warning_msg,
-                warning_level=payload.warning_level,
-                warning_time_start=start,
-                warning_time_end=end,
-                extra={"operation_id": operation_id, "crew_cd": crew_cd},
-            )
+            warnings_to_insert.append({
+                "heat_no": heat_no,
+                "pro_line_cd": PRO_LINE_CD,
+                "proc_cd": proc_cd,
+                "device_no": device_no,
+                "warning_code": payload.warning_code,
+                "warning_msg": payload.warning_msg,
+                "warning_level": payload.warning_level,
+                "warning_time_start": start,
+                "warning_time_end": end,
+                "extra": {"operation_id": operation_id, "crew_cd": crew_cd},
+            })
+
+        return warnings_to_insert
 
     def should_emit_warning_now(self, operation: Dict[str, Any], now: datetime) -> bool:
         max_warnings = self.config.max_warnings_per_operation
@@ -133,7 +171,7 @@ class WarningEngine:
         if not window_start or not window_end:
             return False
 
-        count = self.db.get_operation_warning_count(
+        count, last_end = self.db.get_operation_warning_stats(
             heat_no=operation["heat_no"],
             proc_cd=operation["proc_cd"],
             device_no=operation["device_no"],
@@ -143,13 +181,6 @@ class WarningEngine:
         if count >= max_warnings:
             return False
 
-        last_end = self.db.get_operation_last_warning_end_time(
-            heat_no=operation["heat_no"],
-            proc_cd=operation["proc_cd"],
-            device_no=operation["device_no"],
-            window_start=window_start,
-            window_end=window_end,
-        )
         if last_end is not None:
             op_start = window_start
             op_end = window_end
@@ -163,24 +194,26 @@ class WarningEngine:
 
         return random.random() < self.config.warning_probability_per_tick
 
-    def create_realtime_warning_for_operation(self, operation: Dict[str, Any], now: datetime) -> None:
+    def build_realtime_warning(self, operation: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Build a warning row starting at `now` for an active operation."""
         payload = self.build_warning_payload(operation["proc_cd"])
         duration_seconds = self.random_warning_duration_seconds()
-        warn_start = now
-        warn_end = now + timedelta(seconds=duration_seconds)
+        return {
+            "heat_no": operation["heat_no"],
+            "pro_line_cd": operation["pro_line_cd"],
+            "proc_cd": operation["proc_cd"],
+            "device_no": operation["device_no"],
+            "warning_code": payload.warning_code,
+            "warning_msg": payload.warning_msg,
+            "warning_level": payload.warning_level,
+            "warning_time_start": now,
+            "warning_time_end": now + timedelta(seconds=duration_seconds),
+            "extra": {"operation_id": operation["id"], "crew_cd": operation["crew_cd"]},
+        }
 
-        warn_id = self.db.insert_warning(
-            heat_no=operation["heat_no"],
-            pro_line_cd=operation["pro_line_cd"],
-            proc_cd=operation["proc_cd"],
-            device_no=operation["device_no"],
-            warning_code=payload.warning_code,
-            warning_msg=payload.warning_msg,
-            warning_level=payload.warning_level,
-            warning_time_start=warn_start,
-            warning_time_end=warn_end,
-            extra={"operation_id": operation["id"], "crew_cd": operation["crew_cd"]},
-        )
+    def create_realtime_warning_for_operation(self, operation: Dict[str, Any], now: datetime) -> None:
+        warning = self.build_realtime_warning(operation, now)
+        warn_id = self.db.insert_warning(**warning)
         self.logger.info(
             "Created warning %s for op %s heat %s device %s (%s) %s-%s",
             warn_id,
@@ -188,15 +221,39 @@ class WarningEngine:
             operation["heat_no"],
             operation["device_no"],
             operation["proc_cd"],
-            warn_start,
-            warn_end,
+            warning["warning_time_start"],
+            warning["warning_time_end"],
         )
 
-    def tick_realtime_warnings(self, now: datetime) -> None:
-        for op in self.db.get_active_operations():
+    def tick_realtime_warnings(self, now: datetime, active_ops: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Emit real-time warnings for active operations.
+
+        Warnings for the tick are buffered and written in one batch; each
+        operation is visited once per tick, so its spacing and count checks
+        never depend on a row still in the buffer.
+        """
+        if active_ops is None:
+            active_ops = self.db.get_active_operations()
+
+        warnings_to_insert: List[Dict[str, Any]] = []
+        for op in active_ops:
             if not op.get("real_start_time"):
                 continue
             if op.get("plan_end_time") and now > op["plan_end_time"]:
                 continue
             if self.should_emit_warning_now(op, now):
-                self.create_realtime_warning_for_operation(op, now)
+                warnings_to_insert.append(self.build_realtime_warning(op, now))
+
+        if warnings_to_insert:
+            count = self.db.insert_warnings_batch(warnings_to_insert)
+            for warning in warnings_to_insert:
+                self.logger.info(
+                    "Created warning for op %s heat %s device %s (%s) %s-%s",
+                    warning["extra"]["operation_id"],
+                    warning["heat_no"],
+                    warning["device_no"],
+                    warning["proc_cd"],
+                    warning["warning_time_start"],
+                    warning["warning_time_end"],
+                )
+            self.logger.debug("Emitted %d realtime warnings", count)
@@ -56,7 +56,7 @@ WARNING_TEMPLATES: Dict[str, List[Dict[str, Any]]] = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WarningPayload:
     """Warning data payload."""
     warning_code: Optional[str]
@@ -0,0 +1 @@
+"""Config test package."""
@@ -0,0 +1,49 @@
+"""Unit tests for the configuration package."""
+
+import importlib.util
+
+import steelmaking_simulation.config as config_pkg
+from steelmaking_simulation.config import DatabaseConfig
+from steelmaking_simulation.config._env import env_bool, env_float, env_int, env_str
+
+
+class TestConfigPackage:
+    """Tests for configuration module layout."""
+
+    def test_config_is_a_package_without_shadowing_module(self):
+        """Only the config/ package exists, so settings and .env load once."""
+        spec = importlib.util.find_spec("steelmaking_simulation.config")
+        assert spec.submodule_search_locations is not None
+        package_dir = spec.submodule_search_locations[0]
+        assert importlib.util.find_spec("steelmaking_simulation.config.settings").origin.startswith(package_dir)
+        assert config_pkg.__file__.endswith("__init__.py")
+
+
+class TestEnvReaders:
+    """Tests for the typed environment readers."""
+
+    def test_defaults_are_returned_typed(self):
+        assert env_int("STEELMAKING_TEST_UNSET_INT", 7) == 7
+        assert env_float("STEELMAKING_TEST_UNSET_FLOAT", 0.25) == 0.25
+        assert env_str("STEELMAKING_TEST_UNSET_STR", "x") == "x"
+        assert env_bool("STEELMAKING_TEST_UNSET_BOOL", True) is True
+
+    def test_bool_accepts_common_spellings(self, monkeypatch):
+        monkeypatch.setenv("STEELMAKING_TEST_BOOL_ON", " Yes ")
+        monkeypatch.setenv("STEELMAKING_TEST_BOOL_OFF", "0")
+        assert env_bool("STEELMAKING_TEST_BOOL_ON", False) is True
+        assert env_bool("STEELMAKING_TEST_BOOL_OFF", True) is False
+
+
+class TestDatabaseConfig:
+    """Tests for DatabaseConfig connection parameters."""
+
+    def test_connect_kwargs_pass_password_verbatim(self):
+        config = DatabaseConfig(host="db", port=6432, database="steel", user="sim", password="p w'd")
+        kwargs = config.connect_kwargs()
+        assert kwargs["host"] == "db"
+        assert kwargs["port"] == 6432
+        assert kwargs["dbname"] == "steel"
+        assert kwargs["user"] == "sim"
+        assert kwargs["password"] == "p w'd"
+        assert kwargs["application_name"] == config.application_name
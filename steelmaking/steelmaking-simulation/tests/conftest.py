@@ -1,6 +1,7 @@
 """Pytest configuration and shared fixtures for steelmaking simulation tests."""
 
 import logging
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -12,9 +13,10 @@ from steelmaking_simulation.config import (
     ProcessStatus,
     EQUIPMENT,
     PROCESS_FLOW,
+    HEAT_SEQ_SPAN,
 )
 from steelmaking_simulation.core import SteelmakingSimulator
-from steelmaking_simulation.utils import CST
+from steelmaking_simulation.utils import CST, heat_month_base
 
 
 class FakeDatabaseManager:
@@ -37,11 +39,16 @@ class FakeDatabaseManager:
         return [{"id": 1, "stl_grd_cd": "G-TEST", "stl_grd_nm": "Test Grade"}]
 
     def get_latest_heat_no_for_month(self, year: int, month: int) -> int:
-        lower_bound = int(f"{year:02d}{month:02d}00000")
-        upper_bound = int(f"{year:02d}{month:02d}99999")
+        lower_bound = heat_month_base(year, month)
+        upper_bound = lower_bound + HEAT_SEQ_SPAN
         candidates = [op["heat_no"] for op in self.operations if lower_bound <= op["heat_no"] < upper_bound]
         return max(candidates) if candidates else 0
 
+    def allocate_heat_no(self, year: int, month: int) -> int:
+        latest = self.get_latest_heat_no_for_month(year, month)
+        seq = (latest % HEAT_SEQ_SPAN) + 1 if latest else 1
+        return heat_month_base(year, month) + seq
+
     def insert_operation(
         self,
         heat_no: int,
@@ -77,6 +84,33 @@ class FakeDatabaseManager:
         )
         return op_id
 
+    def insert_operations_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        return [
+            self.insert_operation(
+                heat_no=op["heat_no"],
+                pro_line_cd=op["pro_line_cd"],
+                proc_cd=op["proc_cd"],
+                device_no=op["device_no"],
+                crew_cd=op["crew_cd"],
+                stl_grd_id=op["stl_grd_id"],
+                stl_grd_cd=op["stl_grd_cd"],
+                proc_status=op["proc_status"],
+                plan_start_time=op["plan_start_time"],
+                plan_end_time=op["plan_end_time"],
+                real_start_time=op.get("real_start_time"),
+                real_end_time=op.get("real_end_time"),
+            )
+            for op in operations
+        ]
+
+    def cancel_operations(self, operation_ids: List[int]) -> None:
+        ids = set(operation_ids)
+        for op in self.operations:
+            if op["id"] in ids:
+                op["proc_status"] = ProcessStatus.CANCELED
+                op["real_start_time"] = None
+                op["real_end_time"] = None
+
     def insert_warning(
         self,
         *,
@@ -109,29 +143,37 @@ class FakeDatabaseManager:
         )
         return warn_id
 
-    def get_operation_warning_count(self, *, heat_no, proc_cd, device_no, window_start, window_end) -> int:
-        return sum(
-            1
-            for w in self.warnings
-            if w.get("heat_no") == heat_no
-            and w.get("proc_cd") == proc_cd
-            and w.get("device_no") == device_no
-            and w.get("warning_time_start") >= window_start
-            and w.get("warning_time_start") <= window_end
-        )
+    def insert_warnings_batch(self, warnings: List[Dict[str, Any]]) -> int:
+        for w in warnings:
+            self.insert_warning(
+                heat_no=w["heat_no"],
+                pro_line_cd=w["pro_line_cd"],
+                proc_cd=w["proc_cd"],
+                device_no=w["device_no"],
+                warning_code=w.get("warning_code"),
+                warning_msg=w["warning_msg"],
+                warning_level=w["warning_level"],
+                warning_time_start=w["warning_time_start"],
+                warning_time_end=w["warning_time_end"],
+                extra=w.get("extra"),
+            )
+        return len(warnings)
 
-    def get_operation_last_warning_end_time(self, *, heat_no, proc_cd, device_no, window_start, window_end):
-        ends = [
-            w.get("warning_time_end")
+    def get_operation_warning_stats(self, *, heat_no, proc_cd, device_no, window_start, window_end):
+        matching = [
+            w
             for w in self.warnings
             if w.get("heat_no") == heat_no
             and w.get("proc_cd") == proc_cd
             and w.get("device_no") == device_no
             and w.get("warning_time_start") >= window_start
             and w.get("warning_time_start") <= window_end
-            and w.get("warning_time_end")
         ]
-        return max(ends) if ends else None
+        ends = [w["warning_time_end"] for w in matching if w.get("warning_time_end")]
+        return len(matching), (max(ends) if ends else None)
+
+    def has_active_operations(self) -> bool:
+        return any(op["proc_status"] == ProcessStatus.ACTIVE for op in self.operations)
 
     def get_active_operations(self) -> List[Dict[str, Any]]:
         """Return operations that are ACTIVE."""
@@ -147,6 +189,18 @@ class FakeDatabaseManager:
             key=lambda op: op["plan_start_time"],
         )
 
+    def get_active_and_pending_operations(self):
+        """Return (active, pending) operations."""
+        active = sorted(
+            [op for op in self.operations if op["proc_status"] == ProcessStatus.ACTIVE],
+            key=lambda op: op["real_start_time"] or op["plan_start_time"],
+        )
+        pending = sorted(
+            [op for op in self.operations if op["proc_status"] == ProcessStatus.PENDING],
+            key=lambda op: op["plan_start_time"],
+        )
+        return active, pending
+
     def get_heat_operations(self, heat_no: int) -> List[Dict[str, Any]]:
         """Return all operations for a given heat number."""
         return sorted(
@@ -171,6 +225,10 @@ class FakeDatabaseManager:
                     op["device_no"] = device_no
                 break
 
+    def update_operations_status_batch(self, updates: List[Dict[str, Any]]) -> None:
+        for update in updates:
+            self.update_operation_status(**update)
+
     def update_operation_plan_times(self, operation_id: int, plan_start_time, plan_end_time):
         for op in self.operations:
             if op["id"] == operation_id:
@@ -195,19 +253,27 @@ class FakeDatabaseManager:
                 return device
         return None
 
-    def get_device_operation_windows(self, device_no: str, min_window_start: datetime, exclude_operation_id=None):
+    def get_device_busy_windows(
+        self, device_no: str, desired_start: datetime, exclude_operation_id=None, *, include_pending_plans=True
+    ):
         windows = []
         for op in self.operations:
             if op["device_no"] != device_no:
                 continue
             if exclude_operation_id and op["id"] == exclude_operation_id:
                 continue
-            end_time = op["real_end_time"] or op["plan_end_time"]
-            if op["proc_status"] != ProcessStatus.ACTIVE and end_time < min_window_start:
+            if (
+                not include_pending_plans
+                and op["proc_status"] == ProcessStatus.PENDING
+                and not op["real_start_time"]
+            ):
                 continue
-            windows.append(op)
-        windows.sort(key=lambda op: op["real_start_time"] or op["plan_start_time"])
-        return windows
+            windows.append(
+                (op["real_start_time"] or op["plan_start_time"], op["real_end_time"] or op["plan_end_time"])
+            )
+        windows.sort(key=lambda w: w[0])
+        earlier = [w for w in windows if w[0] <= desired_start]
+        return earlier[-1:] + [w for w in windows if w[0] > desired_start]
 
     # Event methods
     def insert_event(
@@ -260,6 +326,30 @@ class FakeDatabaseManager:
             count += 1
         return count
 
+    def get_operation_event_stats(self, *, heat_no, proc_cd, device_no, window_start, window_end):
+        times = [
+            e.get("event_time_start")
+            for e in self.events
+            if e.get("heat_no") == heat_no
+            and e.get("proc_cd") == proc_cd
+            and e.get("device_no") == device_no
+            and e.get("event_time_start") >= window_start
+            and e.get("event_time_start") <= window_end
+        ]
+        return len(times), (max(times) if times else None)
+
+    def get_operations_event_stats(self, windows):
+        return [
+            self.get_operation_event_stats(
+                heat_no=heat_no,
+                proc_cd=proc_cd,
+                device_no=device_no,
+                window_start=window_start,
+                window_end=window_end,
+            )
+            for heat_no, proc_cd, device_no, window_start, window_end in windows
+        ]
+
     def get_operation_event_count(self, *, heat_no, proc_cd, device_no, window_start, window_end) -> int:
         return sum(
             1
@@ -387,6 +477,9 @@ class FakeDatabaseManager:
     def connect(self): ...
     def close(self): ...
     def cursor(self): raise RuntimeError("Not implemented for fake DB")
+    def bulk_session(self): return nullcontext()
+
+    def transaction(self): return nullcontext()
 
 
 @pytest.fixture
@@ -260,6 +260,48 @@ def test_create_new_heat_allows_long_idle_before_next_planned_window(fixed_now):
     assert bof["plan_end_time"] <= pending_start - timedelta(minutes=sim.config.min_rest_duration_minutes)
 
 
+def test_find_slot_only_reads_windows_from_desired_start(fixed_now):
+    db = FakeDatabaseManager()
+    sim = SteelmakingSimulator(DatabaseConfig(), SimulationConfig(), db_manager=db)
+    device = EQUIPMENT["BOF"]["devices"][0]
+
+    for start, end in (
+        (fixed_now - timedelta(hours=5), fixed_now - timedelta(hours=4)),
+        (fixed_now - timedelta(minutes=50), fixed_now - timedelta(minutes=10)),
+    ):
+        db.insert_operation(
+            heat_no=240100500,
+            pro_line_cd="G1",
+            proc_cd=EQUIPMENT["BOF"]["proc_cd"],
+            device_no=device,
+            crew_cd="A",
+            stl_grd_id=1,
+            stl_grd_cd="G-TEST",
+            proc_status=ProcessStatus.COMPLETED,
+            plan_start_time=start,
+            plan_end_time=end,
+            real_start_time=start,
+            real_end_time=end,
+        )
+
+    # Older history stays on the server; the latest earlier window still bounds rest.
+    assert db.get_device_busy_windows(device, fixed_now) == [
+        (fixed_now - timedelta(minutes=50), fixed_now - timedelta(minutes=10)),
+    ]
+
+    slot = sim.scheduler.find_slot(
+        "BOF",
+        desired_start=fixed_now,
+        latest_start=None,
+        duration=timedelta(minutes=30),
+        devices=[device],
+        enforce_max_rest=False,
+    )
+    min_rest = timedelta(minutes=sim.config.min_rest_duration_minutes)
+    assert slot is not None
+    assert slot.plan_start == max(fixed_now, fixed_now - timedelta(minutes=10) + min_rest)
+
+
 def test_create_new_heat_plans_future_bof_when_no_slot_now(fixed_now):
     import random
 
@@ -405,6 +447,31 @@ def test_initialization_seeds_warnings_for_completed_operations(simulator, fixed
             assert w["warning_time_end"] > w["warning_time_start"]
 
 
+def test_initialization_cancel_marks_subsequent_stages_canceled(simulator, fixed_now):
+    """A seeded cancel event cancels the current and all later stages of the heat."""
+    simulator.events.generator.cancel_probability = 1.0
+    simulator.initialize()
+
+    ops_by_heat = {}
+    for op in simulator.db.operations:
+        ops_by_heat.setdefault(op["heat_no"], []).append(op)
+
+    canceled_heats = 0
+    for heat_ops in ops_by_heat.values():
+        heat_ops.sort(key=lambda op: op["plan_start_time"])
+        statuses = [op["proc_status"] for op in heat_ops]
+        if ProcessStatus.CANCELED not in statuses:
+            continue
+        canceled_heats += 1
+        first_canceled = statuses.index(ProcessStatus.CANCELED)
+        assert all(s == ProcessStatus.CANCELED for s in statuses[first_canceled:])
+        for op in heat_ops[first_canceled + 1:]:
+            assert op["real_start_time"] is None
+            assert op["real_end_time"] is None
+
+    assert canceled_heats, "Expected forced cancel events to cancel some heats"
+
+
 def test_pending_bof_starts_when_plan_time_passed(fixed_now):
     db = FakeDatabaseManager()
     sim = SteelmakingSimulator(DatabaseConfig(), SimulationConfig(), db_manager=db)
@@ -630,10 +697,8 @@ def test_operation_completion_emits_end_events(fixed_now):
     
     # Process active operations - this should complete the operation and emit end events
     # Force completion by making operation past max duration
-    operation = db.operations[0]
-    
-    # Manually trigger completion through the processor
-    sim.processor._complete_operation(operation, fixed_now)
+    sim.config.max_operation_duration = 40
+    sim.processor.process_active_operations()
     
     # Verify operation is now completed
     op = db.operations[0]
@@ -711,7 +776,7 @@ def test_operation_completion_does_not_duplicate_end_events(fixed_now):
     
     # Complete the operation
     operation = db.operations[0]
-    sim.processor._complete_operation(operation, fixed_now)
+    sim.processor._finish_operation(operation, fixed_now)
     
     # Verify no duplicate end sequence events were added
     final_event_count = len(db.events)
@@ -763,7 +828,7 @@ def test_emit_end_sequence_for_lf_operation(fixed_now):
         )
     
     operation = db.operations[0]
-    sim.processor._complete_operation(operation, fixed_now)
+    sim.processor._finish_operation(operation, fixed_now)
     
     # Verify LF end sequence events exist (G13006, G13004, G13002)
     event_codes = [e["event_code"] for e in db.events if e["heat_no"] == heat_no]
@@ -814,7 +879,7 @@ def test_emit_end_sequence_for_ccm_operation(fixed_now):
         )
     
     operation = db.operations[0]
-    sim.processor._complete_operation(operation, fixed_now)
+    sim.processor._finish_operation(operation, fixed_now)
     
     # Verify CCM end sequence events exist
     event_codes = [e["event_code"] for e in db.events if e["heat_no"] == heat_no]
@@ -1205,6 +1270,168 @@ def test_emit_realtime_event_prefers_paired_end(fixed_now):
     assert last_event["event_code"] == "G13025", "Realtime emission should close paired events first"
 
 
+def test_tick_realtime_events_flushes_one_batch(fixed_now, monkeypatch):
+    """Test that a tick writes events for all active operations in a single batch."""
+    db = FakeDatabaseManager()
+    config = SimulationConfig()
+
+    event_engine = EventEngine(
+        db=db,
+        config=config,
+        event_config=EventEngineConfig(event_probability_per_tick=1.0),
+        get_process_name=lambda pc: {"G12": "BOF", "G13": "LF", "G16": "CCM"}.get(pc),
+        logger=logging.getLogger("test"),
+    )
+
+    start_time = fixed_now - timedelta(minutes=10)
+    for idx, process_name in enumerate(PROCESS_FLOW):
+        db.insert_operation(
+            heat_no=240100400 + idx,
+            pro_line_cd="G1",
+            proc_cd=EQUIPMENT[process_name]["proc_cd"],
+            device_no=EQUIPMENT[process_name]["devices"][0],
+            crew_cd="A",
+            stl_grd_id=1,
+            stl_grd_cd="G-TEST",
+            proc_status=ProcessStatus.ACTIVE,
+            plan_start_time=start_time,
+            plan_end_time=start_time + timedelta(minutes=40),
+            real_start_time=start_time,
+            real_end_time=None,
+        )
+
+    batches = []
+    original_batch = db.insert_events_batch
+    monkeypatch.setattr(db, "insert_events_batch", lambda events: batches.append(events) or original_batch(events))
+
+    event_engine.tick_realtime_events(fixed_now)
+
+    assert len(batches) == 1
+    assert len(db.events) == len(batches[0]) == len(db.operations)
+    assert {e["heat_no"] for e in db.events} == {op["heat_no"] for op in db.operations}
+    assert all(e["event_time_start"] == fixed_now for e in db.events)
+
+
+def test_tick_realtime_warnings_flushes_one_batch(fixed_now, monkeypatch):
+    """Test that a tick writes warnings for all active operations in a single batch."""
+    db = FakeDatabaseManager()
+    sim = SteelmakingSimulator(DatabaseConfig(), SimulationConfig(), db_manager=db)
+    sim.config.warning_probability_per_tick = 1.0
+
+    start_time = fixed_now - timedelta(minutes=10)
+    for idx, process_name in enumerate(PROCESS_FLOW):
+        db.insert_operation(
+            heat_no=240100700 + idx,
+            pro_line_cd="G1",
+            proc_cd=EQUIPMENT[process_name]["proc_cd"],
+            device_no=EQUIPMENT[process_name]["devices"][0],
+            crew_cd="A",
+            stl_grd_id=1,
+            stl_grd_cd="G-TEST",
+            proc_status=ProcessStatus.ACTIVE,
+            plan_start_time=start_time,
+            plan_end_time=start_time + timedelta(minutes=40),
+            real_start_time=start_time,
+            real_end_time=None,
+        )
+
+    batches = []
+    original = db.insert_warnings_batch
+    monkeypatch.setattr(db, "insert_warnings_batch", lambda rows: batches.append(rows) or original(rows))
+
+    sim.warnings.tick_realtime_warnings(fixed_now)
+
+    assert len(batches) == 1
+    assert len(db.warnings) == len(batches[0]) == len(db.operations)
+    assert all(w["warning_time_start"] == fixed_now for w in db.warnings)
+
+
+def test_tick_realtime_events_reads_stats_in_one_query(fixed_now, monkeypatch):
+    """Test that a tick reads event stats for all active operations with one query."""
+    db = FakeDatabaseManager()
+    sim = SteelmakingSimulator(DatabaseConfig(), SimulationConfig(), db_manager=db)
+    sim.events.event_config.event_probability_per_tick = 1.0
+
+    start_time = fixed_now - timedelta(minutes=10)
+    for idx, process_name in enumerate(PROCESS_FLOW):
+        db.insert_operation(
+            heat_no=240100800 + idx,
+            pro_line_cd="G1",
+            proc_cd=EQUIPMENT[process_name]["proc_cd"],
+            device_no=EQUIPMENT[process_name]["devices"][0],
+            crew_cd="A",
+            stl_grd_id=1,
+            stl_grd_cd="G-TEST",
+            proc_status=ProcessStatus.ACTIVE,
+            plan_start_time=start_time,
+            plan_end_time=start_time + timedelta(minutes=40),
+            real_start_time=start_time,
+            real_end_time=None,
+        )
+
+    batches = []
+    original = db.get_operations_event_stats
+    monkeypatch.setattr(db, "get_operations_event_stats", lambda windows: batches.append(windows) or original(windows))
+
+    sim.events.tick_realtime_events(fixed_now)
+
+    assert len(batches) == 1
+    assert len(batches[0]) == len(db.operations)
+    assert len(db.events) == len(db.operations)
+
+
+def test_tick_loads_operations_once(simulator, monkeypatch):
+    """Test that one tick shares a single active/pending snapshot across engines."""
+    simulator.initialize()
+    calls = []
+    original = simulator.db.get_active_and_pending_operations
+    monkeypatch.setattr(
+        simulator.db, "get_active_and_pending_operations", lambda: calls.append(1) or original()
+    )
+    for name in ("get_active_operations", "get_pending_operations"):
+        monkeypatch.setattr(simulator.db, name, lambda: pytest.fail("split fetch during tick"))
+    monkeypatch.setattr(simulator.config, "new_heat_probability", 0.0)
+
+    simulator.tick()
+
+    assert len(calls) == 1
+
+
+def test_overdue_operations_complete_in_one_batch(fixed_now, monkeypatch):
+    """Test that all completions of one pass are written with a single batch update."""
+    db = FakeDatabaseManager()
+    sim = SteelmakingSimulator(DatabaseConfig(), SimulationConfig(), db_manager=db)
+    started = fixed_now - timedelta(minutes=sim.config.max_operation_duration + 1)
+    for idx, device in enumerate(EQUIPMENT["BOF"]["devices"][:2]):
+        db.insert_operation(
+            heat_no=240100600 + idx,
+            pro_line_cd="G1",
+            proc_cd=EQUIPMENT["BOF"]["proc_cd"],
+            device_no=device,
+            crew_cd="A",
+            stl_grd_id=1,
+            stl_grd_cd="G-TEST",
+            proc_status=ProcessStatus.ACTIVE,
+            plan_start_time=started,
+            plan_end_time=fixed_now,
+            real_start_time=started,
+            real_end_time=None,
+        )
+
+    batches = []
+    original = db.update_operations_status_batch
+    monkeypatch.setattr(
+        db, "update_operations_status_batch", lambda updates: batches.append(updates) or original(updates)
+    )
+
+    sim.processor.process_active_operations()
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 2
+    assert all(op["proc_status"] == ProcessStatus.COMPLETED for op in db.operations)
+    assert all(op["real_end_time"] == fixed_now for op in db.operations)
+
+
 def test_completed_operation_seeding_includes_all_events(fixed_now):
     """Test that historical seeding backfills all required events."""
     db = FakeDatabaseManager()
@@ -0,0 +1,36 @@
+"""Unit tests for the COPY FROM STDIN helpers."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from steelmaking_simulation.database.copy import format_copy_rows
+from steelmaking_simulation.utils import CST
+
+
+class TestFormatCopyRows:
+    """Tests for format_copy_rows."""
+
+    def test_tab_separated_with_trailing_newline(self):
+        payload = format_copy_rows([(1, "G1", Decimal("12.50"))])
+        assert payload == "1\tG1\t12.50\n"
+
+    def test_none_becomes_null_marker(self):
+        payload = format_copy_rows([(1, None, "")])
+        assert payload == "1\t\\N\t\n"
+
+    def test_datetime_keeps_timezone(self):
+        ts = datetime(2024, 1, 1, 12, 0, 30, tzinfo=CST)
+        payload = format_copy_rows([(ts,)])
+        assert payload == "2024-01-01 12:00:30+08:00\n"
+
+    def test_dict_serialized_as_json(self):
+        payload = format_copy_rows([({"operation_id": 7, "crew_cd": "班组A"},)])
+        assert payload == '{"operation_id":7,"crew_cd":"班组A"}\n'
+
+    def test_special_characters_escaped(self):
+        payload = format_copy_rows([("a\tb\nc\\d\re",)])
+        assert payload == "a\\tb\\nc\\\\d\\re\n"
+
+    def test_multiple_rows(self):
+        payload = format_copy_rows([(1, "x"), (2, "y")])
+        assert payload.splitlines() == ["1\tx", "2\ty"]
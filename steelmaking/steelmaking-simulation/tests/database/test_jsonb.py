@@ -0,0 +1,38 @@
+"""Unit tests for jsonb parameter encoding."""
+
+import json
+
+from steelmaking_simulation.database.jsonb import jsonb_param, jsonb_params
+
+
+class TestJsonbParam:
+    """Tests for jsonb_param."""
+
+    def test_none_stays_null(self):
+        assert jsonb_param(None) is None
+
+    def test_compact_and_keeps_non_ascii(self):
+        payload = jsonb_param({"operation_id": 7, "crew_cd": "班组A"})
+        assert payload == '{"operation_id":7,"crew_cd":"班组A"}'
+
+    def test_round_trips(self):
+        extra = {"values": [1, 2.5, None], "nested": {"ok": True}}
+        assert json.loads(jsonb_param(extra)) == extra
+
+
+class TestJsonbParams:
+    """Tests for jsonb_params."""
+
+    def test_shared_object_is_encoded_once(self, monkeypatch):
+        import steelmaking_simulation.database.jsonb as jsonb
+
+        calls = []
+        original = jsonb.jsonb_param
+        monkeypatch.setattr(jsonb, "jsonb_param", lambda value: calls.append(value) or original(value))
+        shared = {"operation_id": 7}
+        encoded = jsonb_params([shared, shared, None, shared])
+        assert encoded == ['{"operation_id":7}', '{"operation_id":7}', None, '{"operation_id":7}']
+        assert len(calls) == 2
+
+    def test_equal_but_distinct_objects_encode_separately(self):
+        assert jsonb_params([{"a": 1}, {"a": 2}]) == ['{"a":1}', '{"a":2}']
@@ -0,0 +1,216 @@
+"""Unit tests for DatabaseManager helpers that do not need a live server."""
+
+from contextlib import contextmanager
+
+import pytest
+
+from steelmaking_simulation.config import DatabaseConfig
+from steelmaking_simulation.database import DatabaseManager
+from steelmaking_simulation.database.operations import OperationQueries
+
+
+class _GradeCursor:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def execute(self, sql, params=None):
+        self.calls.append(sql)
+
+    def fetchall(self):
+        return [{"id": 1, "stl_grd_cd": "G1", "stl_grd_nm": "Grade 1"}]
+
+
+class _FailingCursor:
+    def execute(self, sql, params=None):
+        raise RuntimeError("query failed")
+
+
+class _TransactionConn:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def reusable_cursor(self, cursor_factory):
+        return _FailingCursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _manager_with_conn(conn):
+    db = DatabaseManager(DatabaseConfig())
+
+    @contextmanager
+    def get_conn():
+        yield conn
+
+    db.get_conn = get_conn
+    return db
+
+
+def _manager_with_counting_cursor():
+    db = DatabaseManager(DatabaseConfig())
+    calls = []
+
+    @contextmanager
+    def cursor(cursor_factory=None):
+        yield _GradeCursor(calls)
+
+    db.read_cursor = cursor
+    return db, calls
+
+
+class TestSteelGradeCache:
+    """Tests for the in-process steel grade cache."""
+
+    def test_second_call_is_served_from_memory(self):
+        db, calls = _manager_with_counting_cursor()
+        first = db.get_steel_grades()
+        second = db.get_steel_grades()
+        assert first == second
+        assert len(calls) == 1
+
+    def test_expired_cache_reloads(self):
+        db, calls = _manager_with_counting_cursor()
+        db.get_steel_grades()
+        db.get_steel_grades(ttl=0)
+        assert len(calls) == 2
+
+    def test_invalidate_forces_reload(self):
+        db, calls = _manager_with_counting_cursor()
+        db.get_steel_grades()
+        db.invalidate_steel_grades()
+        db.get_steel_grades()
+        assert len(calls) == 2
+
+
+class TestTransaction:
+    """Tests for the deferred-commit transaction block."""
+
+    def test_caught_query_error_still_fails_the_block(self):
+        conn = _TransactionConn()
+        db = _manager_with_conn(conn)
+        with pytest.raises(RuntimeError, match="query failed"):
+            with db.transaction():
+                try:
+                    with db.cursor() as cur:
+                        cur.execute("SELECT 1")
+                except RuntimeError:
+                    pass
+        assert conn.commits == 0
+        assert conn.rollbacks == 1
+
+    def test_failed_cursor_outside_a_transaction_rolls_back(self):
+        conn = _TransactionConn()
+        db = _manager_with_conn(conn)
+        with pytest.raises(RuntimeError):
+            with db.cursor() as cur:
+                cur.execute("SELECT 1")
+        assert conn.rollbacks == 1
+
+
+class _PersistenceCursor:
+    def __init__(self, relpersistence):
+        self.relpersistence = relpersistence
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        return {"relpersistence": self.relpersistence}
+
+
+def _clear_operations(relpersistence, unlogged_demo_mode):
+    db = DatabaseManager(DatabaseConfig(unlogged_demo_mode=unlogged_demo_mode))
+    cur = _PersistenceCursor(relpersistence)
+
+    @contextmanager
+    def cursor(cursor_factory=None):
+        yield cur
+
+    db.cursor = cursor
+    db.clear_operations()
+    return [sql for sql in cur.statements if sql.startswith("ALTER")]
+
+
+class TestClearOperations:
+    """Tests for the demo reset."""
+
+    def test_matching_persistence_skips_alter(self):
+        assert _clear_operations("p", unlogged_demo_mode=False) == []
+        assert _clear_operations("u", unlogged_demo_mode=True) == []
+
+    def test_demo_mode_sets_unlogged(self):
+        assert _clear_operations("p", unlogged_demo_mode=True) == [
+            "ALTER TABLE steelmaking.steelmaking_kpi_stats SET UNLOGGED"
+        ]
+
+    def test_turning_demo_mode_off_restores_logged(self):
+        assert _clear_operations("u", unlogged_demo_mode=False) == [
+            "ALTER TABLE steelmaking.steelmaking_kpi_stats SET LOGGED"
+        ]
+
+
+    def test_heat_sequences_are_restarted(self):
+        db = DatabaseManager(DatabaseConfig())
+        cur = _PersistenceCursor("p")
+
+        @contextmanager
+        def cursor(cursor_factory=None):
+            yield cur
+
+        db.cursor = cursor
+        db.clear_operations()
+        assert any("setval" in sql and "heat_seq_" in sql for sql in cur.statements)
+
+
+def _manager_counting_heat_sequences(monkeypatch, conn):
+    db = _manager_with_conn(conn)
+    ensured = []
+    monkeypatch.setattr(
+        OperationQueries,
+        "ensure_heat_sequence",
+        lambda db, year, month: ensured.append((year, month)),
+    )
+    monkeypatch.setattr(OperationQueries, "next_heat_no", lambda db, year, month: 1)
+    return db, ensured
+
+
+class TestAllocateHeatNo:
+    """Tests for the per-process record of created heat sequences."""
+
+    def test_sequence_is_ensured_once_outside_a_transaction(self, monkeypatch):
+        db, ensured = _manager_counting_heat_sequences(monkeypatch, _TransactionConn())
+        db.allocate_heat_no(24, 1)
+        db.allocate_heat_no(24, 1)
+        assert ensured == [(24, 1)]
+
+    def test_sequence_created_in_a_committed_block_is_remembered(self, monkeypatch):
+        db, ensured = _manager_counting_heat_sequences(monkeypatch, _TransactionConn())
+        with db.transaction():
+            db.allocate_heat_no(24, 1)
+            db.allocate_heat_no(24, 1)
+        db.allocate_heat_no(24, 1)
+        assert ensured == [(24, 1)]
+
+    def test_sequence_created_in_a_rolled_back_block_is_ensured_again(self, monkeypatch):
+        db, ensured = _manager_counting_heat_sequences(monkeypatch, _TransactionConn())
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.allocate_heat_no(24, 1)
+                raise RuntimeError("block failed")
+        db.allocate_heat_no(24, 1)
+        assert ensured == [(24, 1), (24, 1)]
+
+
+class TestLatestHeatNo:
+    """Tests for the year-month heat number lookup."""
+
+    def test_invalid_month_raises_before_querying(self):
+        db = DatabaseManager(DatabaseConfig())
+        with pytest.raises(ValueError):
+            db.get_latest_heat_no_for_month(24, 13)
@@ -13,6 +13,7 @@ from steelmaking_simulation.events import (
     EVENT_CODES,
     EVENT_SEQUENCE_CONFIGS,
     PROC_CD_TO_NAME,
+    SPECIAL_EVENTS_BY_PROC_CD,
     SpecialEventType,
 )
 from steelmaking_simulation.utils import CST
@@ -471,6 +472,19 @@ class TestEventCodesCompleteness:
         assert PROC_CD_TO_NAME["G15"] == "RH"
         assert PROC_CD_TO_NAME["G16"] == "CCM"
 
+    def test_special_events_by_proc_cd_match_sequence_configs(self):
+        """Test that the precomputed cancel/rework lookup mirrors the sequence configs."""
+        assert SPECIAL_EVENTS_BY_PROC_CD == {
+            "G12": ("G12007", None),
+            "G13": ("G13008", "G13007"),
+            "G15": ("G15008", "G15007"),
+            "G16": ("G16015", None),
+        }
+        for proc_cd, (cancel_event, rework_event) in SPECIAL_EVENTS_BY_PROC_CD.items():
+            config = EVENT_SEQUENCE_CONFIGS[PROC_CD_TO_NAME[proc_cd]]
+            assert cancel_event == config.cancel_event
+            assert rework_event == config.rework_event
+
 
 class TestSpecialEvents:
     """Tests for cancel (取消) and rework (回炉) special events."""
@@ -0,0 +1 @@
+"""Utils test package."""
@@ -0,0 +1,13 @@
+"""Unit tests for heat number helpers."""
+
+from steelmaking_simulation.utils import heat_month_base
+
+
+class TestHeatMonthBase:
+    """Tests for heat_month_base."""
+
+    def test_two_digit_year(self):
+        assert heat_month_base(24, 1) == 240100000
+
+    def test_four_digit_year_uses_last_two_digits(self):
+        assert heat_month_base(2024, 12) == heat_month_base(24, 12) == 241200000
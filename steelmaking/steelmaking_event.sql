@@ -19,4 +19,9 @@ CREATE TABLE steelmaking.steelmaking_event (
 );
 
 CREATE INDEX idx_stlmk_event_heat_device
-    ON steelmaking.steelmaking_event (heat_no, device_no);
\ No newline at end of file
+    ON steelmaking.steelmaking_event (heat_no, device_no);
+
+-- 作业时间窗内的事件数量 / 最近开始时间 / 已有事件码（覆盖索引，可走 index-only scan）
+CREATE INDEX idx_stlmk_event_op_window
+    ON steelmaking.steelmaking_event (heat_no, proc_cd, device_no, event_time_start)
+    INCLUDE (event_time_end, event_code);
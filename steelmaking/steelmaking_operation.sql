@@ -21,6 +21,12 @@ CREATE TABLE steelmaking.steelmaking_operation (
     real_start_time  TIMESTAMPTZ,
     real_end_time    TIMESTAMPTZ,
 
+    -- 设备占用时间窗（实际时间优先，未开始/未结束时取计划时间）
+    effective_start_time TIMESTAMPTZ
+        GENERATED ALWAYS AS (COALESCE(real_start_time, plan_start_time)) STORED,
+    effective_end_time   TIMESTAMPTZ
+        GENERATED ALWAYS AS (COALESCE(real_end_time, plan_end_time)) STORED,
+
     extra            JSONB,
 
     created_at timestamptz NOT NULL DEFAULT now(),
@@ -43,4 +49,24 @@ CREATE INDEX idx_stlmk_op_bof_plan_time
 
 -- 3. 加速产线监控查询
 CREATE INDEX idx_stlmk_op_heat_no
-    ON steelmaking.steelmaking_operation (heat_no);
\ No newline at end of file
+    ON steelmaking.steelmaking_operation (heat_no);
+
+-- 4. 取消炉次（proc_status = 3，占比很小，用部分索引避免全表扫描）
+CREATE INDEX idx_stlmk_op_canceled
+    ON steelmaking.steelmaking_operation (heat_no, plan_start_time)
+    WHERE proc_status = 3;
+
+-- 5. 设备当前作业 / 空闲设备探测（进行中/待执行，按状态+计划时间有序，LIMIT 1 无需排序）
+CREATE INDEX idx_stlmk_op_device_current
+    ON steelmaking.steelmaking_operation (device_no, proc_status, plan_start_time)
+    WHERE proc_status IN (1, 2);
+
+-- 6. 进行中/待执行作业列表及是否存在进行中作业（只索引未完成作业，占比很小）
+CREATE INDEX idx_stlmk_op_open_status
+    ON steelmaking.steelmaking_operation (proc_status, plan_start_time)
+    WHERE proc_status IN (1, 2);
+
+-- 7. 设备时间窗按有效开始时间有序（排程查空档时无需排序）
+CREATE INDEX idx_stlmk_op_device_window
+    ON steelmaking.steelmaking_operation (device_no, effective_start_time)
+    INCLUDE (effective_end_time);
@@ -0,0 +1,24 @@
+-- 已有库升级：为 steelmaking_operation 增加设备占用时间窗生成列及索引
+-- 新建库直接执行 steelmaking_operation.sql 即可，无需本脚本。
+--
+-- 执行说明：
+--   1. ADD COLUMN ... GENERATED ... STORED 会重写整表并持有 ACCESS EXCLUSIVE 锁，
+--      请在维护窗口内、以表属主身份执行，执行期间先停止模拟程序。
+--   2. CREATE INDEX CONCURRENTLY 不能在事务块内执行，请用 psql 逐条执行
+--      （不要加 -1 / --single-transaction）。
+
+-- 1. 设备占用时间窗（实际时间优先，未开始/未结束时取计划时间）
+ALTER TABLE steelmaking.steelmaking_operation
+    ADD COLUMN IF NOT EXISTS effective_start_time TIMESTAMPTZ
+        GENERATED ALWAYS AS (COALESCE(real_start_time, plan_start_time)) STORED,
+    ADD COLUMN IF NOT EXISTS effective_end_time   TIMESTAMPTZ
+        GENERATED ALWAYS AS (COALESCE(real_end_time, plan_end_time)) STORED;
+
+-- 2. 设备时间窗按有效开始时间有序（排程查空档时无需排序；CONCURRENTLY 不阻塞写入）
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stlmk_op_device_window
+    ON steelmaking.steelmaking_operation (device_no, effective_start_time)
+    INCLUDE (effective_end_time);
+
+-- 3. 可选：按炉次号查询也可走 uq_heat_device (heat_no, device_no) 的唯一索引。
+--    确认没有其他客户端依赖单列 heat_no 索引后，由 DBA 决定是否删除：
+-- DROP INDEX CONCURRENTLY IF EXISTS steelmaking.idx_stlmk_op_heat_no;
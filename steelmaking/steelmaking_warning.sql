@@ -20,4 +20,9 @@ CREATE TABLE steelmaking.steelmaking_warning (
 );
 
 CREATE INDEX idx_stlmk_warn_heat_device
-    ON steelmaking.steelmaking_warning (heat_no, device_no);
\ No newline at end of file
+    ON steelmaking.steelmaking_warning (heat_no, device_no);
+
+-- 作业时间窗内的报警数量 / 最近结束时间（覆盖索引，可走 index-only scan）
+CREATE INDEX idx_stlmk_warn_op_window
+    ON steelmaking.steelmaking_warning (heat_no, proc_cd, device_no, warning_time_start)
+    INCLUDE (warning_time_end);